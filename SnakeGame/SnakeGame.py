@@ -3,7 +3,6 @@ from core.core_initializer import CoreInitializer
 from .game_scene.snake_game_main import SnakeGameScene
 from .game_scene.snake_game_menu import MenuScene
 from .game_scene.test_scene import TestScene
-import cProfile
 class SnakeGame:
     """スネークゲーム (Slither.io スタイル)"""
 
@@ -4,6 +4,7 @@ from core.component.transform import Transform
 from core.component.sprite import Sprite
 from core.network.network_transform import NetworkTransform
 from core.component.physics.circle_collider import CircleCollider
+from SnakeGame import physics_layers
 import pygame
 class Food(NetworkGameObject):
     """食べ物 (スネークが食べる)"""
@@ -13,7 +14,7 @@ class Food(NetworkGameObject):
         self.sprite = self.add_component(Sprite, image_path="SnakeGame/assets/food.png", base_size=(50, 50))
         self.network_transform = self.add_component(NetworkTransform)
         self.transform.position = pygame.Vector2(position)
-        self.collision = self.add_component(CircleCollider, radius=25)
+        self.collision = self.add_component(CircleCollider, radius=25, layer=physics_layers.FOOD, mask=physics_layers.FOOD_MASK, is_trigger=True)
         self.score = 1
 
 # **自動で NetworkObjectFactory に登録**
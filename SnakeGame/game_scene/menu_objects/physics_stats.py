@@ -0,0 +1,20 @@
+from core.panel import Panel
+from core.UI.object.mesh_text import MeshText
+
+class PhysicsStats(Panel):
+    """物理エンジンのフェーズ別計測を表示するオーバーレイ (FrameRate と同じく右上に表示)"""
+    def __init__(self, canvas, physics_engine, name="PhysicsStats", visible=True, interval=0.5):
+        FONT_PATH = "KH-Dot-Dougenzaka-12.ttf"
+        super().__init__(name, canvas, visible)
+        self.stats = MeshText(canvas, "physics_stats", font_path=FONT_PATH, font_ratio=0.03, position=("right-400", "top+160"))
+        self.add_ui(self.stats)
+        self.profiler = physics_engine.enable_profiling()  # **計測を有効化**
+        self.interval = interval  # 表示を更新する間隔 [秒]
+        self.elapsed = 0.0
+
+    def update(self, dt):
+        super().update(dt)
+        self.elapsed += dt
+        if self.elapsed >= self.interval:
+            self.elapsed = 0.0
+            self.stats.set_text(self.profiler.summary())
@@ -0,0 +1,12 @@
+# ------------------------------
+# スネークゲームの衝突レイヤー (Collider.layer / mask のビット)
+# ------------------------------
+
+SNAKE = 1 << 0
+FOOD = 1 << 1
+WALL = 1 << 2
+
+# **衝突する相手** (食べ物同士・壁同士は判定しない)
+SNAKE_MASK = SNAKE | FOOD | WALL
+FOOD_MASK = SNAKE
+WALL_MASK = SNAKE
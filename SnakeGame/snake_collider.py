@@ -2,18 +2,25 @@ from core.component.physics.circle_collider import CircleCollider
 from core.component.component import Component
 from core.network.network_manager import NetworkManager
 from core.global_event_manager import GlobalEventManager
+from SnakeGame import physics_layers
 
 class SnakeCollider(Component):
     def __init__(self, game_object, radius):
         super().__init__(game_object)
-        self.collider = game_object.add_component(CircleCollider, radius=radius)
+        self.collider = game_object.add_component(CircleCollider, radius=radius, layer=physics_layers.SNAKE, mask=physics_layers.SNAKE_MASK)
 
         if not self.collider:
-            self.collider = CircleCollider(game_object, radius)
+            self.collider = CircleCollider(game_object, radius, layer=physics_layers.SNAKE, mask=physics_layers.SNAKE_MASK)
         self.network_manager = NetworkManager.get_instance()
 
-        self.collider.event.register_event("on_collision", self.on_collision)
-        
+        # ✅ 食べ物はトリガーなので、重なりの開始がステップごとにまとめて通知される
+        game_object.event_manager.register_event("on_trigger", self.on_trigger)
+
+    def on_trigger(self, entered, exited):
+        """トリガーの重なり開始・終了 (1 ステップ分まとめて)"""
+        for other in entered:
+            self.on_collision(other)
+
     def on_collision(self, other):
         """衝突時の処理 (Food / Wall)"""
         if other.game_object.name == "Food":
@@ -22,7 +29,7 @@ class SnakeCollider(Component):
             if self.network_manager.is_server:
                 self.game_object.event_manager.trigger_event("on_food_eaten", snake=self.game_object, food=other.game_object)
 
-        elif other.game_objectr.name == "Wall":
+        elif other.game_object.name == "Wall":
             print(f"❌ {self.game_object.name} が壁に衝突!")
             
             # **サーバーでゲームオーバー処理**
@@ -0,0 +1,134 @@
+"""
+ブロードフェーズのベンチマーク (1フレームあたりの狭域判定ペア数)
+
+実行方法 (リポジトリのルートで):
+    python -m benchmarks.broad_phase
+    python -m benchmarks.broad_phase --counts 100 1000 10000 --frames 5
+    python -m benchmarks.broad_phase --verify   # 総当たりと接触集合が一致するか検証
+    python -m benchmarks.broad_phase --mixed    # 小さな食べ物と巨大な壁が混在する配置
+"""
+import argparse
+import math
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from core.game_object import GameObject
+from core.component.physics.circle_collider import CircleCollider
+from core.component.physics.box_collider import BoxCollider
+from core.physics_engine import PhysicsEngine
+from core.broad_phase import BruteForceBroadPhase, SpatialHashGrid, SweepAndPrune, DynamicAABBTree
+from core.physics_function import compute_collision_manifold
+
+def build_objects(count, seed=0, density=100.0, box_ratio=0.1, mixed=False):
+    """
+    コライダー密度を一定に保った正方形アリーナにオブジェクトを配置
+    :param mixed: True なら小さな円 (食べ物) を中心に、アリーナを横切る巨大な壁を 1% 混ぜる
+    """
+    rng = random.Random(seed)
+    size = math.sqrt(count) * density
+    objects = []
+    for i in range(count):
+        obj = GameObject(f"Body_{i}")
+        if mixed:
+            roll = rng.random()
+            if roll < 0.01:
+                length = rng.uniform(size * 0.2, size * 0.6)
+                if rng.random() < 0.5:
+                    obj.add_component(BoxCollider, width=length, height=40)
+                else:
+                    obj.add_component(BoxCollider, width=40, height=length)
+            elif roll < 0.1:
+                obj.add_component(BoxCollider, width=rng.uniform(20, 80), height=rng.uniform(20, 80))
+            else:
+                obj.add_component(CircleCollider, radius=rng.uniform(3, 12))
+        elif rng.random() < box_ratio:
+            obj.add_component(BoxCollider, width=rng.uniform(20, 80), height=rng.uniform(20, 80))
+        else:
+            obj.add_component(CircleCollider, radius=25)
+        obj.transform.local_position = pygame.Vector2(rng.uniform(0, size), rng.uniform(0, size))
+        obj.transform.update_transform()
+        objects.append(obj)
+    return objects
+
+def run(engine, objects, frames):
+    """`frames` フレーム分衝突判定を行い、(平均ペア数, 平均時間[ms]) を返す"""
+    engine.update_scene(objects)
+    total_pairs = 0
+    start = time.perf_counter()
+    for _ in range(frames):
+        engine.resolve_collisions()
+        total_pairs += engine.pair_tests
+    elapsed = time.perf_counter() - start
+    return total_pairs / frames, elapsed / frames * 1000
+
+def contact_set(broad_phase):
+    """ブロードフェーズの候補ペアのうち、実際に接触しているペアの集合"""
+    broad_phase.update()
+    contacts = set()
+    for col1, col2 in broad_phase.compute_pairs():
+        if compute_collision_manifold(col1, col2):
+            contacts.add(frozenset((col1, col2)))
+    return contacts
+
+def verify(count, frames, cell_size, seed=1, mixed=False):
+    """オブジェクトを動かしながら、各ブロードフェーズの接触集合が総当たりと一致するか検証"""
+    rng = random.Random(seed)
+    objects = build_objects(count, seed=seed, mixed=mixed)
+    colliders = [obj.get_component(CircleCollider) or obj.get_component(BoxCollider) for obj in objects]
+    reference = BruteForceBroadPhase()
+    candidates = {
+        "spatial_hash": SpatialHashGrid(cell_size), "sweep_and_prune": SweepAndPrune(), "aabb_tree": DynamicAABBTree()
+    }
+    for broad_phase in [reference, *candidates.values()]:
+        broad_phase.sync(colliders)
+
+    ok = True
+    for frame in range(frames):
+        expected = contact_set(reference)
+        for name, broad_phase in candidates.items():
+            actual = contact_set(broad_phase)
+            if actual != expected:
+                ok = False
+                print(f"❌ frame={frame} {name}: missing={len(expected - actual)} extra={len(actual - expected)}")
+        # 一部だけ動かす (静止物と移動物の混在)
+        for obj in rng.sample(objects, max(1, count // 10)):
+            obj.transform.local_position += pygame.Vector2(rng.uniform(-60, 60), rng.uniform(-60, 60))
+            obj.transform.update_transform()
+    print(f"{'✅' if ok else '❌'} verify: colliders={count} frames={frames}")
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--frames", type=int, default=5)
+    parser.add_argument("--cell-size", type=float, default=128)
+    parser.add_argument("--max-brute", type=int, default=2000, help="これを超える数では総当たりを実行せずペア数だけ表示")
+    parser.add_argument("--verify", action="store_true", help="総当たりとの差分検証のみ実行")
+    parser.add_argument("--mixed", action="store_true", help="大きさの異なるコライダー (食べ物と巨大な壁) を混在させる")
+    args = parser.parse_args()
+
+    if args.verify:
+        raise SystemExit(0 if verify(min(args.counts), args.frames * 4, args.cell_size, mixed=args.mixed) else 1)
+
+    print(f"{'colliders':>10} {'broad_phase':>14} {'pairs/frame':>14} {'ms/frame':>10}")
+    for count in args.counts:
+        objects = build_objects(count, mixed=args.mixed)
+        brute_pairs = count * (count - 1) // 2
+        if count <= args.max_brute:
+            pairs, ms = run(PhysicsEngine(BruteForceBroadPhase()), objects, args.frames)
+            print(f"{count:>10} {'brute_force':>14} {pairs:>14.0f} {ms:>10.2f}")
+        else:
+            print(f"{count:>10} {'brute_force':>14} {brute_pairs:>14} {'(skip)':>10}")
+        pairs, ms = run(PhysicsEngine(SpatialHashGrid(args.cell_size)), objects, args.frames)
+        print(f"{count:>10} {'spatial_hash':>14} {pairs:>14.0f} {ms:>10.2f}")
+        pairs, ms = run(PhysicsEngine(SweepAndPrune()), objects, args.frames)
+        print(f"{count:>10} {'sweep_prune':>14} {pairs:>14.0f} {ms:>10.2f}")
+        pairs, ms = run(PhysicsEngine(DynamicAABBTree()), objects, args.frames)
+        print(f"{count:>10} {'aabb_tree':>14} {pairs:>14.0f} {ms:>10.2f}")
+
+if __name__ == "__main__":
+    main()
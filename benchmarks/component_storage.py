@@ -0,0 +1,70 @@
+"""
+ComponentStorage のベンチマーク (フロアからオブジェクトを削除するコストがフロアの大きさに依存しないか)
+
+実行方法 (リポジトリのルートで):
+    python -m benchmarks.component_storage
+    python -m benchmarks.component_storage --counts 1000 8000 32000 --removals 500
+"""
+import argparse
+import gc
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from core.game_object import GameObject
+from core.component.physics.circle_collider import CircleCollider
+from core.map.floor import Floor
+
+def build_floor(count):
+    """トリガーの円コライダーを持つオブジェクトを count 個並べたフロア"""
+    floor = Floor("benchmark", 1)
+    objects = []
+    for i in range(count):
+        obj = GameObject(f"Food_{i}")
+        obj.transform.set_local_position((i * 10.0, 0))
+        obj.add_component(CircleCollider, radius=5, is_trigger=True)
+        floor.add_object(obj)
+        objects.append(obj)
+    return floor, objects
+
+def measure_removal(count, removals):
+    """removals 個を削除したときの 1 個あたりの時間 [µs] (ComponentStorage.remove_object のみ)"""
+    floor, objects = build_floor(count)
+    targets = objects[::max(1, count // removals)][:removals]
+    gc.disable()  # GC の停止時間を計測に含めない
+    try:
+        start = time.perf_counter()
+        for obj in targets:
+            floor.components.remove_object(obj)
+        return (time.perf_counter() - start) / len(targets) * 1e6
+    finally:
+        gc.enable()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", type=int, nargs="+", default=[1000, 4000, 8000])
+    parser.add_argument("--removals", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3, help="計測回数 (最小値を採用)")
+    parser.add_argument(
+        "--max-ratio", type=float, default=0.5,
+        help="削除コストの比の上限 (フロアの大きさの比に対する割合・比例して増えるなら 1 前後)"
+    )
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'objects':>8} {'µs/removal':>11}")
+    for count in args.counts:
+        cost = min(measure_removal(count, args.removals) for _ in range(args.repeat))
+        results.append(cost)
+        print(f"{count:>8} {cost:>11.2f}")
+
+    # ✅ 削除コストはフロアの大きさにほぼ依存しないこと (キャッシュの影響による多少の増加は許容)
+    ratio = results[-1] / results[0]
+    limit = max(4.0, args.max_ratio * args.counts[-1] / args.counts[0])
+    assert ratio < limit, f"削除コストがフロアの大きさに比例して増えています (比 {ratio:.1f} >= {limit:.1f})"
+    print(f"ratio {ratio:.2f} (< {limit:.2f})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+物理演算のベンチマーク (ディスプレイなしで Floor / PhysicsEngine のシーンを N フレーム進める)
+
+実行方法 (リポジトリのルートで):
+    python -m benchmarks.physics
+    python -m benchmarks.physics --counts 500 2000 --frames 300 --backend numpy --broad-phase aabb_tree
+    python -m benchmarks.physics --format csv --output result.csv   # コミット間の比較用
+    python -m benchmarks.physics --allocations                       # 1 フレームあたりの一時メモリも計測
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # 標準出力を結果だけにする
+
+import pygame
+from core.game_object import GameObject
+from core.component.physics.rigidbody import RigidBody
+from core.component.physics.circle_collider import CircleCollider
+from core.component.physics.box_collider import BoxCollider
+from core.map.floor import Floor
+from core.broad_phase import BruteForceBroadPhase, SpatialHashGrid, SweepAndPrune, DynamicAABBTree
+from core.contact_solver import ContactSolver
+
+BROAD_PHASES = {
+    "brute_force": BruteForceBroadPhase,
+    "spatial_hash": SpatialHashGrid,
+    "sweep_prune": SweepAndPrune,
+    "aabb_tree": DynamicAABBTree,
+}
+
+def build_floor(count, broad_phase="spatial_hash", backend="python", solver=False, step_rate=60,
+                box_ratio=0.2, density=60.0, seed=0):
+    """動的な円・矩形と、アリーナを囲む静的な壁を持つ Floor を作る"""
+    rng = random.Random(seed)
+    floor = Floor("benchmark", 1, BROAD_PHASES[broad_phase]())
+    engine = floor.physics_engine
+    engine.set_step_rate(step_rate)
+    if solver:
+        engine.solver = ContactSolver()
+    if backend == "numpy":
+        from core.numpy_physics import NumpyPhysicsBackend
+        engine.set_backend(NumpyPhysicsBackend())
+
+    size = math.sqrt(count) * density
+    for i in range(count):
+        obj = GameObject(f"Body_{i}")
+        obj.transform.local_position = pygame.Vector2(rng.uniform(0, size), rng.uniform(0, size))
+        rb = obj.add_component(RigidBody, gravity=pygame.Vector2(0, 0), restitution=0.9)
+        rb.velocity = pygame.Vector2(rng.uniform(-120, 120), rng.uniform(-120, 120))
+        if rng.random() < box_ratio:
+            obj.add_component(BoxCollider, width=rng.uniform(10, 30), height=rng.uniform(10, 30))
+        else:
+            obj.add_component(CircleCollider, radius=rng.uniform(5, 15))
+        obj.transform.update_transform()
+        floor.add_object(obj)
+
+    # **壁** (上下左右)
+    for name, x, y, w, h in (
+        ("Wall_top", -50, -50, size + 100, 50), ("Wall_bottom", -50, size, size + 100, 50),
+        ("Wall_left", -50, 0, 50, size), ("Wall_right", size, 0, 50, size),
+    ):
+        wall = GameObject(name)
+        wall.transform.local_position = pygame.Vector2(x, y)
+        wall.add_component(RigidBody, is_static=True)
+        wall.add_component(BoxCollider, width=w, height=h)
+        wall.transform.update_transform()
+        floor.add_object(wall)
+    return floor
+
+def percentile(values, ratio):
+    """最近傍順位法によるパーセンタイル"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(ratio * len(ordered)) - 1))
+    return ordered[index]
+
+def measure_frame_allocations(floor, dt, frames):
+    """
+    tracemalloc で 1 フレームあたりのメモリを計測し (一時確保の最大量 KB, 残った量 KB) の平均を返す
+    - 一時確保: フレーム中の確保量の最大値 - フレーム開始時の確保量 (Vector2 などの一時オブジェクト)
+    """
+    tracemalloc.start()
+    transient = retained = 0
+    for _ in range(frames):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        floor.update(dt)
+        current, peak = tracemalloc.get_traced_memory()
+        transient += peak - before
+        retained += current - before
+    tracemalloc.stop()
+    return transient / frames / 1024, retained / frames / 1024
+
+def run_case(count, frames, warmup=10, memory_frames=10, allocations=False, **options):
+    """1 ケースを実行して結果の辞書を返す (時間計測と tracemalloc による最大メモリ計測は別々に実行)"""
+    floor = build_floor(count, **options)
+    dt = 1.0 / options.get("step_rate", 60)
+    for _ in range(warmup):
+        floor.update(dt)
+    step_times = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        floor.update(dt)
+        step_times.append((time.perf_counter() - start) * 1000)
+    engine = floor.physics_engine
+    pairs, contacts = engine.pair_tests, engine.contact_count
+
+    # **最大メモリ** (tracemalloc は遅くなるので時間計測とは別に、構築から数フレームまで)
+    tracemalloc.start()
+    floor = build_floor(count, **options)
+    for _ in range(memory_frames):
+        floor.update(dt)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    if allocations:
+        frame_kb, retained_kb = measure_frame_allocations(floor, dt, memory_frames)
+
+    total = sum(step_times)
+    result = {
+        "bodies": count,
+        "frames": frames,
+        "broad_phase": options.get("broad_phase", "spatial_hash"),
+        "backend": options.get("backend", "python"),
+        "solver": bool(options.get("solver", False)),
+        "steps_per_sec": frames / (total / 1000) if total > 0 else float("inf"),
+        "mean_ms": total / frames,
+        "p50_ms": percentile(step_times, 0.50),
+        "p99_ms": percentile(step_times, 0.99),
+        "peak_memory_kb": peak / 1024,
+        "pairs": pairs,
+        "contacts": contacts,
+    }
+    if allocations:
+        result["frame_alloc_kb"] = frame_kb
+        result["frame_retained_kb"] = retained_kb
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--broad-phase", choices=sorted(BROAD_PHASES), default="spatial_hash")
+    parser.add_argument("--backend", choices=["python", "numpy"], default="python")
+    parser.add_argument("--solver", action="store_true", help="ContactSolver を使う")
+    parser.add_argument("--box-ratio", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--allocations", action="store_true", help="1 フレームあたりの一時メモリ確保量を tracemalloc で計測")
+    parser.add_argument("--format", choices=["json", "csv"], default="json")
+    parser.add_argument("--output", help="結果の出力先 (省略時は標準出力)")
+    args = parser.parse_args()
+
+    results = []
+    for count in args.counts:
+        result = run_case(
+            count, args.frames, warmup=args.warmup, broad_phase=args.broad_phase, backend=args.backend,
+            solver=args.solver, box_ratio=args.box_ratio, seed=args.seed, allocations=args.allocations
+        )
+        results.append(result)
+        print(
+            f"bodies={count} {result['steps_per_sec']:.1f} steps/s "
+            f"p50={result['p50_ms']:.2f}ms p99={result['p99_ms']:.2f}ms peak={result['peak_memory_kb']:.0f}KB",
+            file=sys.stderr
+        )
+
+    output = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    try:
+        if args.format == "json":
+            json.dump({
+                "python": platform.python_version(),
+                "pygame": pygame.version.ver,
+                "platform": platform.platform(),
+                "results": results,
+            }, output, indent=2)
+            output.write("\n")
+        else:
+            writer = csv.DictWriter(output, fieldnames=list(results[0]))
+            writer.writeheader()
+            writer.writerows(results)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+描画のベンチマーク (ディスプレイなしで広いアリーナに食べ物を並べ、カメラの描画を N フレーム計測)
+
+実行方法 (リポジトリのルートで):
+    python -m benchmarks.render
+    python -m benchmarks.render --counts 1000 10000 --arena 10000 --frames 100
+    python -m benchmarks.render --no-culling   # カリングなしとの比較
+    python -m benchmarks.render --no-batching  # Surface.blits による一括描画なしとの比較
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+from core.game_object import GameObject
+from core.component.sprite import Sprite
+from core.component.physics.circle_collider import CircleCollider
+from core.map.world_manager import WorldManager
+from core.map.floor import Floor
+from core.canvas import Canvas
+from core.camera import Camera
+
+FOOD_IMAGE = "SnakeGame/assets/food.png"
+
+class BenchmarkScene:
+    """GameScene の代わりに world / canvas だけを持つシーン (ネットワーク関連を読み込まない)"""
+    def __init__(self, screen):
+        self.world = WorldManager(self)
+        self.canvas = Canvas(screen)
+
+def build_scene(screen, count, arena=10000.0, colliders=True, seed=0):
+    """arena × arena の範囲に食べ物のスプライトを並べ、中央を映すカメラを作る"""
+    rng = random.Random(seed)
+    scene = BenchmarkScene(screen)
+    floor = scene.world.add_floor(Floor("benchmark", 1))
+    for i in range(count):
+        obj = GameObject(f"Food_{i}")
+        obj.transform.set_local_position((rng.uniform(0, arena), rng.uniform(0, arena)))
+        obj.add_component(Sprite, image_path=FOOD_IMAGE, base_size=(50, 50))
+        if colliders:
+            obj.add_component(CircleCollider, radius=25, is_trigger=True)
+        floor.add_object(obj)
+    camera = Camera(scene.canvas, view_size=screen.get_size())
+    camera.set_scene(scene)
+    camera.set_active(True)
+    camera.transform.set_local_position((arena / 2, arena / 2))
+    scene.world.update(1 / 60)  # ブロードフェーズの AABB を計算
+    return scene, camera
+
+def render_frame(scene, camera, screen):
+    scene.world.render(camera)
+    camera.render_scene(screen)
+
+def run_case(screen, count, frames, arena, culling=True, colliders=True, batching=True):
+    scene, camera = build_scene(screen, count, arena, colliders)
+    camera.culling = culling
+    camera.batching = batching
+    render_frame(scene, camera, screen)  # ウォームアップ (スプライトの変換キャッシュ)
+    start = time.perf_counter()
+    for _ in range(frames):
+        render_frame(scene, camera, screen)
+    elapsed = (time.perf_counter() - start) * 1000
+    return {
+        "objects": count,
+        "culling": culling,
+        "colliders": colliders,
+        "batching": batching,
+        "mean_ms": elapsed / frames,
+        "drawn": camera.drawn_count,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--frames", type=int, default=50)
+    parser.add_argument("--arena", type=float, default=10000.0, help="アリーナの一辺 (ワールド座標)")
+    parser.add_argument("--size", type=int, nargs=2, default=[1280, 720], help="画面サイズ")
+    parser.add_argument("--no-culling", action="store_true")
+    parser.add_argument("--no-colliders", action="store_true", help="コライダーなし (空間インデックスを使わない)")
+    parser.add_argument("--no-batching", action="store_true", help="スプライトを 1 件ずつ blit する")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode(args.size)
+    print(f"{'objects':>8} {'drawn':>7} {'ms/frame':>9}")
+    for count in args.counts:
+        result = run_case(
+            screen, count, args.frames, args.arena, culling=not args.no_culling, colliders=not args.no_colliders,
+            batching=not args.no_batching
+        )
+        print(f"{result['objects']:>8} {result['drawn']:>7} {result['mean_ms']:>9.2f}")
+        sys.stdout.flush()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,603 @@
+import math
+
+# ------------------------------
+# ブロードフェーズ (狭域判定の候補ペアを絞り込む)
+# ------------------------------
+
+def layers_match(a, b):
+    """プロキシ同士のレイヤー・マスクが両方向で一致するか"""
+    return (a.layer & b.mask) != 0 and (b.layer & a.mask) != 0
+
+def aabb_overlap(a, b):
+    """AABB 同士が重なっているか (接している場合も候補に含める)"""
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+class BroadPhaseProxy:
+    """ブロードフェーズに登録されたコライダーの情報"""
+    def __init__(self, collider, proxy_id):
+        self.collider = collider
+        self.id = proxy_id   # 登録順の ID (ペアの向きを登録順に揃える)
+        self.aabb = None     # 最後に計算した AABB
+        self.cells = None    # 空間ハッシュ上のセル範囲 (ix0, iy0, ix1, iy1)
+        self.layer = collider.layer  # 衝突フィルタ (Collider から複製)
+        self.mask = collider.mask
+
+class BroadPhase:
+    """ブロードフェーズの基底クラス (総当たり)"""
+    def __init__(self):
+        self.proxies = {}    # {collider: BroadPhaseProxy}
+        self._next_id = 0
+        self.pair_tests = 0  # 直近のフレームで生成した候補ペア数
+
+    def add(self, collider):
+        """コライダーを登録"""
+        if collider in self.proxies:
+            return self.proxies[collider]
+        proxy = BroadPhaseProxy(collider, self._next_id)
+        self._next_id += 1
+        self.proxies[collider] = proxy
+        self.on_add(proxy)
+        return proxy
+
+    def remove(self, collider):
+        """コライダーの登録を解除"""
+        proxy = self.proxies.pop(collider, None)
+        if proxy is not None:
+            self.on_remove(proxy)
+
+    def refresh_filter(self, collider):
+        """コライダーのレイヤー・マスクの変更を反映"""
+        proxy = self.proxies.get(collider)
+        if proxy is not None:
+            proxy.layer = collider.layer
+            proxy.mask = collider.mask
+
+    def sync(self, colliders):
+        """与えられたコライダー一覧と登録内容を一致させる (差分のみ追加・削除)"""
+        current = set(colliders)
+        for collider in [c for c in self.proxies if c not in current]:
+            self.remove(collider)
+        for collider in colliders:
+            if collider not in self.proxies:
+                self.add(collider)
+
+    def clear(self):
+        """すべての登録を解除"""
+        for collider in list(self.proxies):
+            self.remove(collider)
+
+    def on_add(self, proxy):
+        """登録時の処理 (オーバーライド用)"""
+        pass
+
+    def on_remove(self, proxy):
+        """登録解除時の処理 (オーバーライド用)"""
+        pass
+
+    def update(self):
+        """移動したコライダーの AABB を更新 (オーバーライド用)"""
+        for proxy in self.proxies.values():
+            proxy.aabb = proxy.collider.get_aabb()
+
+    def compute_pairs(self):
+        """候補ペアのリストを返す (登録順の小さい方が先)"""
+        proxies = sorted(self.proxies.values(), key=lambda p: p.id)
+        pairs = []
+        for i in range(len(proxies)):
+            for j in range(i + 1, len(proxies)):
+                if layers_match(proxies[i], proxies[j]):
+                    pairs.append((proxies[i].collider, proxies[j].collider))
+        self.pair_tests = len(pairs)
+        return pairs
+
+    def query_aabb(self, aabb):
+        """AABB と重なるコライダーのリストを返す (オーバーライド用・デフォルトは全件走査)"""
+        result = []
+        for proxy in self.proxies.values():
+            if proxy.aabb is not None and aabb_overlap(aabb, proxy.aabb):
+                result.append(proxy.collider)
+        return result
+
+class BruteForceBroadPhase(BroadPhase):
+    """全ペアを候補とする総当たりブロードフェーズ (O(n²)・比較用)"""
+    pass
+
+class SpatialHashGrid(BroadPhase):
+    """一様グリッドによる空間ハッシュのブロードフェーズ"""
+    def __init__(self, cell_size=128):
+        """
+        :param cell_size: セルの一辺の長さ (ワールド座標・代表的なコライダー直径の 2〜4 倍が目安)
+        """
+        super().__init__()
+        self.cell_size = cell_size
+        self.cells = {}  # {(ix, iy): [BroadPhaseProxy]}
+
+    def _cell_range(self, aabb):
+        """AABB が占めるセル範囲を計算"""
+        size = self.cell_size
+        return (
+            math.floor(aabb[0] / size), math.floor(aabb[1] / size),
+            math.floor(aabb[2] / size), math.floor(aabb[3] / size)
+        )
+
+    def _insert(self, proxy):
+        ix0, iy0, ix1, iy1 = proxy.cells
+        for ix in range(ix0, ix1 + 1):
+            for iy in range(iy0, iy1 + 1):
+                self.cells.setdefault((ix, iy), []).append(proxy)
+
+    def _erase(self, proxy):
+        ix0, iy0, ix1, iy1 = proxy.cells
+        for ix in range(ix0, ix1 + 1):
+            for iy in range(iy0, iy1 + 1):
+                bucket = self.cells.get((ix, iy))
+                if bucket is None:
+                    continue
+                bucket.remove(proxy)
+                if not bucket:
+                    del self.cells[(ix, iy)]
+
+    def on_add(self, proxy):
+        proxy.aabb = proxy.collider.get_aabb()
+        if proxy.aabb is None:
+            return
+        proxy.cells = self._cell_range(proxy.aabb)
+        self._insert(proxy)
+
+    def on_remove(self, proxy):
+        if proxy.cells is not None:
+            self._erase(proxy)
+            proxy.cells = None
+
+    def update(self):
+        """AABB を更新し、セル範囲が変わったコライダーだけ再登録 (動いていないものはそのまま)"""
+        for proxy in self.proxies.values():
+            aabb = proxy.collider.get_aabb()
+            if aabb == proxy.aabb:
+                continue
+            proxy.aabb = aabb
+            cells = None if aabb is None else self._cell_range(aabb)
+            if cells == proxy.cells:
+                continue
+            if proxy.cells is not None:
+                self._erase(proxy)
+            proxy.cells = cells
+            if cells is not None:
+                self._insert(proxy)
+
+    def query_aabb(self, aabb):
+        """AABB が占めるセルに登録されたコライダーのうち、AABB が重なるものを返す"""
+        ix0, iy0, ix1, iy1 = self._cell_range(aabb)
+        seen = set()
+        result = []
+        for ix in range(ix0, ix1 + 1):
+            for iy in range(iy0, iy1 + 1):
+                for proxy in self.cells.get((ix, iy), ()):
+                    if proxy in seen:
+                        continue
+                    seen.add(proxy)
+                    if aabb_overlap(aabb, proxy.aabb):
+                        result.append(proxy.collider)
+        return result
+
+    def compute_pairs(self):
+        """同じセルを共有し AABB が重なるペアを返す"""
+        pairs = []
+        for (ix, iy), bucket in self.cells.items():
+            count = len(bucket)
+            if count < 2:
+                continue
+            for i in range(count):
+                a = bucket[i]
+                for j in range(i + 1, count):
+                    b = bucket[j]
+                    # ✅ 複数セルを共有するペアは「最初に共有するセル」でのみ報告 (重複排除)
+                    if ix != max(a.cells[0], b.cells[0]) or iy != max(a.cells[1], b.cells[1]):
+                        continue
+                    if not layers_match(a, b) or not aabb_overlap(a.aabb, b.aabb):
+                        continue
+                    if a.id < b.id:
+                        pairs.append((a.collider, b.collider))
+                    else:
+                        pairs.append((b.collider, a.collider))
+        self.pair_tests = len(pairs)
+        return pairs
+
+class SweepAndPrune(BroadPhase):
+    """軸ごとのソート済み端点リストによるスイープ＆プルーン (フレーム間で並びを保持)"""
+    MIN = 0
+    MAX = 1
+
+    def __init__(self):
+        super().__init__()
+        # 端点: [値, MIN/MAX, proxy] (値が同じなら MIN を先にして接触も候補に含める)
+        self.axes = ([], [])  # (x軸の端点リスト, y軸の端点リスト)
+        self.proxy_endpoints = {}  # {proxy: ((x_min, x_max), (y_min, y_max))}
+        self._appended = False     # 末尾に未整列の端点があるか
+
+    def on_add(self, proxy):
+        proxy.aabb = proxy.collider.get_aabb()
+        if proxy.aabb is not None:
+            self._insert(proxy)
+
+    def on_remove(self, proxy):
+        if proxy in self.proxy_endpoints:
+            self._erase(proxy)
+
+    def _insert(self, proxy):
+        endpoints = []
+        for axis in (0, 1):
+            lo = [proxy.aabb[axis], self.MIN, proxy]
+            hi = [proxy.aabb[axis + 2], self.MAX, proxy]
+            # 末尾に追加し、次の update で正しい位置へ移動させる
+            self.axes[axis].append(lo)
+            self.axes[axis].append(hi)
+            endpoints.append((lo, hi))
+        self.proxy_endpoints[proxy] = tuple(endpoints)
+        self._appended = True
+
+    def _erase(self, proxy):
+        del self.proxy_endpoints[proxy]
+        for axis in (0, 1):
+            self.axes[axis][:] = [ep for ep in self.axes[axis] if ep[2] is not proxy]
+
+    @staticmethod
+    def _insertion_sort(endpoints):
+        """挿入ソート (前フレームからの移動が小さければほぼ線形時間)"""
+        for i in range(1, len(endpoints)):
+            ep = endpoints[i]
+            value, kind = ep[0], ep[1]
+            j = i - 1
+            while j >= 0:
+                prev = endpoints[j]
+                if prev[0] < value or (prev[0] == value and prev[1] <= kind):
+                    break
+                endpoints[j + 1] = prev
+                j -= 1
+            endpoints[j + 1] = ep
+
+    def update(self):
+        """端点の値を更新して各軸を挿入ソート"""
+        for proxy in self.proxies.values():
+            aabb = proxy.collider.get_aabb()
+            if aabb == proxy.aabb:
+                continue
+            proxy.aabb = aabb
+            if aabb is None:
+                if proxy in self.proxy_endpoints:
+                    self._erase(proxy)
+                continue
+            if proxy not in self.proxy_endpoints:
+                self._insert(proxy)
+                continue
+            for axis, (lo, hi) in enumerate(self.proxy_endpoints[proxy]):
+                lo[0] = aabb[axis]
+                hi[0] = aabb[axis + 2]
+        for endpoints in self.axes:
+            if self._appended:
+                # 大量に追加された直後は挿入ソートが O(n²) になるので一括ソート
+                endpoints.sort(key=lambda ep: (ep[0], ep[1]))
+            else:
+                self._insertion_sort(endpoints)
+        self._appended = False
+
+    def query_aabb(self, aabb):
+        """x 軸の端点リストを走査し、AABB が重なるコライダーを返す (query の右端を超えたら打ち切り)"""
+        if self._appended:
+            # 追加直後 (update の前) は末尾の端点が未整列なので、打ち切る前に並べる
+            for endpoints in self.axes:
+                endpoints.sort(key=lambda ep: (ep[0], ep[1]))
+            self._appended = False
+        result = []
+        for value, kind, proxy in self.axes[0]:
+            if value > aabb[2]:
+                break
+            if kind == self.MIN and aabb_overlap(aabb, proxy.aabb):
+                result.append(proxy.collider)
+        return result
+
+    def _sweep_axis(self):
+        """分布の広い軸をスイープ軸に選ぶ (壁が横一列に並ぶ場面では x 軸)"""
+        x_axis, y_axis = self.axes
+        if not x_axis:
+            return 0
+        x_extent = x_axis[-1][0] - x_axis[0][0]
+        y_extent = y_axis[-1][0] - y_axis[0][0]
+        return 0 if x_extent >= y_extent else 1
+
+    def compute_pairs(self):
+        """スイープ軸上で区間が重なり、かつ AABB も重なるペアを返す"""
+        pairs = []
+        active = {}
+        for value, kind, proxy in self.axes[self._sweep_axis()]:
+            if kind == self.MAX:
+                active.pop(proxy, None)
+                continue
+            aabb = proxy.aabb
+            for other in active:
+                if not layers_match(proxy, other) or not aabb_overlap(aabb, other.aabb):
+                    continue
+                if proxy.id < other.id:
+                    pairs.append((proxy.collider, other.collider))
+                else:
+                    pairs.append((other.collider, proxy.collider))
+            active[proxy] = True
+        self.pair_tests = len(pairs)
+        return pairs
+
+def aabb_union(a, b):
+    """2 つの AABB を囲む AABB"""
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+def aabb_perimeter(aabb):
+    """AABB の周長 (2D での挿入コストの指標)"""
+    return 2 * ((aabb[2] - aabb[0]) + (aabb[3] - aabb[1]))
+
+def aabb_contains(outer, inner):
+    """outer が inner を完全に含むか"""
+    return outer[0] <= inner[0] and outer[1] <= inner[1] and inner[2] <= outer[2] and inner[3] <= outer[3]
+
+class AABBTreeNode:
+    """動的 AABB ツリーのノード (葉は proxy を持つ)"""
+    def __init__(self, aabb, proxy=None):
+        self.aabb = aabb       # 葉: 余白付きの AABB (fat AABB) / 内部ノード: 子を囲む AABB
+        self.proxy = proxy
+        self.parent = None
+        self.child1 = None
+        self.child2 = None
+        self.height = 0        # 葉は 0
+
+    def is_leaf(self):
+        return self.child1 is None
+
+class DynamicAABBTree(BroadPhase):
+    """
+    動的 AABB ツリー (BVH) のブロードフェーズ
+    - 葉には余白付きの AABB (fat AABB) を登録し、その中に収まる移動ではツリーを変更しない
+    - 挿入位置は周長の増加が最小となる兄弟を選び、回転で高さのバランスを保つ
+    - 大きさの異なるコライダーが混在していても 1 つの葉で済む (グリッドのように複数セルへ登録しない)
+    - fat AABB 同士が重なるペアを保持し、入れ直した葉だけツリーを探索して更新する
+    """
+    def __init__(self, margin=8.0):
+        """
+        :param margin: fat AABB の余白 (ワールド座標・大きいほどツリーの更新が減り候補が増える)
+        """
+        super().__init__()
+        self.margin = margin
+        self.root = None
+        self.leaves = {}  # {BroadPhaseProxy: AABBTreeNode}
+        self.neighbors = {}  # {BroadPhaseProxy: {fat AABB が重なる相手: None}} (dict を順序付きセットとして使用)
+        self.moved = {}      # 次の compute_pairs で相手を探し直す proxy
+
+    def _fatten(self, aabb):
+        m = self.margin
+        return (aabb[0] - m, aabb[1] - m, aabb[2] + m, aabb[3] + m)
+
+    def on_add(self, proxy):
+        self.neighbors[proxy] = {}
+        proxy.aabb = proxy.collider.get_aabb()
+        if proxy.aabb is not None:
+            self._insert_proxy(proxy)
+
+    def on_remove(self, proxy):
+        self._drop_proxy(proxy)
+        del self.neighbors[proxy]
+
+    def refresh_filter(self, collider):
+        """レイヤー・マスクが変わったら相手を探し直す"""
+        super().refresh_filter(collider)
+        proxy = self.proxies.get(collider)
+        if proxy in self.leaves:
+            self.moved[proxy] = None
+
+    def _insert_proxy(self, proxy):
+        leaf = AABBTreeNode(self._fatten(proxy.aabb), proxy)
+        self.leaves[proxy] = leaf
+        self._insert_leaf(leaf)
+        self.moved[proxy] = None
+
+    def _drop_proxy(self, proxy):
+        """ツリーとペアから proxy を取り除く"""
+        leaf = self.leaves.pop(proxy, None)
+        if leaf is not None:
+            self._remove_leaf(leaf)
+        for other in self.neighbors[proxy]:
+            del self.neighbors[other][proxy]
+        self.neighbors[proxy].clear()
+        self.moved.pop(proxy, None)
+
+    def update(self):
+        """AABB を更新し、fat AABB からはみ出した葉だけ入れ直す"""
+        for proxy in self.proxies.values():
+            aabb = proxy.collider.get_aabb()
+            if aabb == proxy.aabb:
+                continue
+            proxy.aabb = aabb
+            leaf = self.leaves.get(proxy)
+            if aabb is None:
+                self._drop_proxy(proxy)
+                continue
+            if leaf is None:
+                self._insert_proxy(proxy)
+            elif not aabb_contains(leaf.aabb, aabb):
+                self._remove_leaf(leaf)
+                leaf.aabb = self._fatten(aabb)
+                self._insert_leaf(leaf)
+                self.moved[proxy] = None
+
+    # ** ツリー操作 **
+    def _insert_leaf(self, leaf):
+        if self.root is None:
+            self.root = leaf
+            leaf.parent = None
+            return
+
+        # **兄弟の選択** (周長の増加が最小になる位置まで降りる)
+        leaf_aabb = leaf.aabb
+        node = self.root
+        while not node.is_leaf():
+            perimeter = aabb_perimeter(node.aabb)
+            combined = aabb_perimeter(aabb_union(node.aabb, leaf_aabb))
+            cost = 2 * combined                   # ここで新しい親を作るコスト
+            inheritance = 2 * (combined - perimeter)  # 下へ降りる場合に祖先が広がるコスト
+            costs = []
+            for child in (node.child1, node.child2):
+                enlarged = aabb_perimeter(aabb_union(child.aabb, leaf_aabb))
+                if not child.is_leaf():
+                    enlarged -= aabb_perimeter(child.aabb)
+                costs.append(enlarged + inheritance)
+            if cost < costs[0] and cost < costs[1]:
+                break
+            node = node.child1 if costs[0] < costs[1] else node.child2
+
+        # **新しい親ノードを作って兄弟と葉をぶら下げる**
+        sibling = node
+        old_parent = sibling.parent
+        new_parent = AABBTreeNode(aabb_union(sibling.aabb, leaf_aabb))
+        new_parent.parent = old_parent
+        new_parent.height = sibling.height + 1
+        if old_parent is None:
+            self.root = new_parent
+        elif old_parent.child1 is sibling:
+            old_parent.child1 = new_parent
+        else:
+            old_parent.child2 = new_parent
+        new_parent.child1 = sibling
+        new_parent.child2 = leaf
+        sibling.parent = new_parent
+        leaf.parent = new_parent
+        self._refit(new_parent.parent)
+
+    def _remove_leaf(self, leaf):
+        if leaf is self.root:
+            self.root = None
+            return
+        parent = leaf.parent
+        grandparent = parent.parent
+        sibling = parent.child2 if parent.child1 is leaf else parent.child1
+        leaf.parent = None
+        if grandparent is None:
+            self.root = sibling
+            sibling.parent = None
+            return
+        if grandparent.child1 is parent:
+            grandparent.child1 = sibling
+        else:
+            grandparent.child2 = sibling
+        sibling.parent = grandparent
+        self._refit(grandparent)
+
+    def _refit(self, node):
+        """node から根まで、回転でバランスを取りつつ AABB と高さを更新"""
+        while node is not None:
+            node = self._balance(node)
+            child1, child2 = node.child1, node.child2
+            node.height = 1 + max(child1.height, child2.height)
+            node.aabb = aabb_union(child1.aabb, child2.aabb)
+            node = node.parent
+
+    def _replace_child(self, parent, old, new):
+        if parent is None:
+            self.root = new
+        elif parent.child1 is old:
+            parent.child1 = new
+        else:
+            parent.child2 = new
+
+    def _balance(self, a):
+        """a の左右の高さの差が 2 以上なら高い側の子を持ち上げる (回転) ・新しい部分木の根を返す"""
+        if a.is_leaf() or a.height < 2:
+            return a
+        b, c = a.child1, a.child2
+        balance = c.height - b.height
+        if balance > 1:
+            # **c を持ち上げる**
+            f, g = c.child1, c.child2
+            c.child1 = a
+            c.parent = a.parent
+            a.parent = c
+            self._replace_child(c.parent, a, c)
+            if f.height > g.height:
+                c.child2, a.child2, g.parent = f, g, a
+                keep = f
+            else:
+                c.child2, a.child2, f.parent = g, f, a
+                keep = g
+            a.aabb = aabb_union(b.aabb, a.child2.aabb)
+            a.height = 1 + max(b.height, a.child2.height)
+            c.aabb = aabb_union(a.aabb, keep.aabb)
+            c.height = 1 + max(a.height, keep.height)
+            return c
+        if balance < -1:
+            # **b を持ち上げる**
+            d, e = b.child1, b.child2
+            b.child1 = a
+            b.parent = a.parent
+            a.parent = b
+            self._replace_child(b.parent, a, b)
+            if d.height > e.height:
+                b.child2, a.child1, e.parent = d, e, a
+                keep = d
+            else:
+                b.child2, a.child1, d.parent = e, d, a
+                keep = e
+            a.aabb = aabb_union(c.aabb, a.child1.aabb)
+            a.height = 1 + max(c.height, a.child1.height)
+            b.aabb = aabb_union(a.aabb, keep.aabb)
+            b.height = 1 + max(a.height, keep.height)
+            return b
+        return a
+
+    # ** 探索 **
+    def _query_leaves(self, aabb):
+        """AABB と fat AABB が重なる葉を列挙"""
+        if self.root is None:
+            return
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if not aabb_overlap(aabb, node.aabb):
+                continue
+            if node.child1 is None:
+                yield node.proxy
+            else:
+                stack.append(node.child1)
+                stack.append(node.child2)
+
+    def query_aabb(self, aabb):
+        """ツリーをたどり、AABB が重なるコライダーを返す"""
+        return [proxy.collider for proxy in self._query_leaves(aabb) if aabb_overlap(aabb, proxy.aabb)]
+
+    def _update_neighbors(self):
+        """入れ直した葉だけツリーを探索し、fat AABB が重なる相手を更新"""
+        neighbors = self.neighbors
+        for proxy in self.moved:
+            leaf = self.leaves[proxy]
+            current = neighbors[proxy]
+            found = {}
+            for other in self._query_leaves(leaf.aabb):
+                if other is not proxy and layers_match(proxy, other) and aabb_overlap(leaf.aabb, self.leaves[other].aabb):
+                    found[other] = None
+            for other in current:
+                if other not in found:
+                    del neighbors[other][proxy]
+            for other in found:
+                neighbors[other][proxy] = None
+            neighbors[proxy] = found
+        self.moved.clear()
+
+    def compute_pairs(self):
+        """fat AABB が重なる相手のうち、実際の AABB も重なるペアを返す (ID の小さい側からのみ報告して重複排除)"""
+        self._update_neighbors()
+        pairs = []
+        for proxy, others in self.neighbors.items():
+            aabb = proxy.aabb
+            for other in others:
+                if other.id > proxy.id and aabb_overlap(aabb, other.aabb):
+                    pairs.append((proxy.collider, other.collider))
+        self.pair_tests = len(pairs)
+        return pairs
+
+    def get_height(self):
+        """ツリーの高さ (バランスの確認用)"""
+        return 0 if self.root is None else self.root.height
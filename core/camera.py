@@ -1,6 +1,10 @@
 import pygame
 from core.game_object import GameObject
 from core.component.transform import Transform
+from core.component.sprite import Sprite
+from core.component.physics.collider import Collider
+from core.broad_phase import aabb_overlap, aabb_union
+from core.render_queue import RenderQueue
 from core.coroutine import Coroutine, WaitForSeconds
 import math
 
@@ -29,7 +33,9 @@ class Camera(GameObject):
         self.view_canvas_size = pygame.Rect((0, 0), self.canvas_size) if view_canvas_size is None else pygame.Rect(view_canvas_size)
         self.zoom = zoom  # **ズーム倍率**
         self.floor_level = 1  # ✅ 現在の階層
-        self.floor_objects = {}  # {floor_level: [objects]}
+        self.floor_objects = {}  # {floor_level: {object: None}} (フロアに属さないオブジェクトを個別に登録したもの)
+        self.floors = {}         # {floor_level: Floor} (Floor.render で登録・描画リストはフロアが保持)
+        self._render_levels = None  # 描画するフロアのレベル (昇順・登録が変わったら作り直す)
         # ✅ 追尾用の変数
         self.target = None
         self.follow_speed = 5.0
@@ -38,17 +44,43 @@ class Camera(GameObject):
         self.render_objects = []
 
         self.layers = []
+        self._layer_order = (None, [], [])  # (キャッシュのキー, 背景レイヤー, 近景レイヤー) (parallax_factor 順)
+        self.render_target = None  # **毎フレーム使い回す描画先 (view_canvas_size が変わったら作り直す)**
+        self.batching = True       # **スプライトを RenderQueue に積んで Surface.blits でまとめて描画**
+        self.render_queue = RenderQueue()
+
+        # ✅ 視錐台カリング (視界と重なるオブジェクトだけ描画)
+        self.culling = True
+        self.cull_margin = 64.0  # **視界の外側に含める余白 (ワールド座標・大きなスプライトのはみ出し用)**
+        self.drawn_count = 0     # 直近のフレームで描画したオブジェクト数
+        self.culled_count = 0    # 直近のフレームで視界外として省いたオブジェクト数
+    # ✅ フロアの登録
+    def register_floor(self, floor):
+        """フロアの描画リストを描画対象にする (毎フレーム呼ばれても登録済みなら何もしない)"""
+        if self.floors.get(floor.level) is not floor:
+            self.floors[floor.level] = floor
+            self._render_levels = None
+
     # ✅ フロアごとのオブジェクト登録
     def register_object(self, obj, floor_level):
-        """オブジェクトを指定したフロアに登録（重複防止）"""
-        # ✅ フロアが未登録なら初期化
-        if floor_level not in self.floor_objects:
-            self.floor_objects[floor_level] = set()  # **リストからセットに変更**
+        """フロアに属さないオブジェクトを指定したフロアの高さに登録 (重複防止・unregister_object まで描画)"""
+        objects = self.floor_objects.get(floor_level)
+        if objects is None:
+            objects = self.floor_objects[floor_level] = {}  # **登録順を保つ辞書**
+            self._render_levels = None
+        objects[obj] = None
 
-        # ✅ 既に存在しない場合のみ追加
-        if obj not in self.floor_objects[floor_level]:
-            self.floor_objects[floor_level].add(obj)  # **セットなら重複防止が簡単**
+    def unregister_object(self, obj, floor_level):
+        """register_object で登録したオブジェクトを外す"""
+        objects = self.floor_objects.get(floor_level)
+        if objects is not None:
+            objects.pop(obj, None)
 
+    def get_render_levels(self):
+        """描画するフロアのレベル (下の階から)"""
+        if self._render_levels is None:
+            self._render_levels = sorted(set(self.floors) | set(self.floor_objects))
+        return self._render_levels
 
 
     # ✅ フロアごとのスケールを計算
@@ -86,6 +118,19 @@ class Camera(GameObject):
             new_pos = current_pos.lerp(target_pos, eased_t)
 
             self.transform.set_local_position(new_pos)
+    def get_screen_mapping(self):
+        """
+        ワールド座標 → スクリーン座標の一次変換 (scale_x, scale_y, offset_x, offset_y)
+        - screen = world * scale + offset (world_to_screen と同じ式を 1 フレーム分まとめて計算)
+        """
+        view_w, view_h = self.view_size
+        center_x, center_y = self.transform.get_local_position()  # **カメラの中心**
+        view_x = center_x - (view_w / 2) / self.zoom
+        view_y = center_y - (view_h / 2) / self.zoom
+        scale_x = self.view_canvas_size.width / (view_w / self.zoom)
+        scale_y = self.view_canvas_size.height / (view_h / self.zoom)
+        return scale_x, scale_y, self.view_canvas_size.x - view_x * scale_x, self.view_canvas_size.y - view_y * scale_y
+
     def world_to_screen(self, world_position):
         """
         ワールド座標をスクリーン座標に変換
@@ -127,6 +172,63 @@ class Camera(GameObject):
         scale_y = self.view_canvas_size.height / (self.view_size.y / self.zoom)
         return pygame.Vector2(scale_x, scale_y)
 
+    def get_view_aabb(self, margin=0.0):
+        """ワールド座標での視界の AABB (min_x, min_y, max_x, max_y)"""
+        center_x, center_y = self.transform.get_local_position()  # **カメラの中心**
+        half_w = self.view_size.x / 2 / self.zoom + margin
+        half_h = self.view_size.y / 2 / self.zoom + margin
+        return (center_x - half_w, center_y - half_h, center_x + half_w, center_y + half_h)
+
+    def get_world_bounds(self, obj, screen_scale):
+        """描画範囲の AABB (スプライトの画像サイズとコライダーの AABB を合わせたもの)"""
+        position = obj.transform.get_interpolated_position()
+        half_w = half_h = 0.0
+        sprite = obj.get_component(Sprite)
+        if sprite is not None and sprite.transformed_image is not None:
+            # スプライトはスクリーン上のピクセルサイズで描画されるので、ワールド座標に換算
+            width, height = sprite.transformed_image.get_size()
+            half_w = width / 2 / screen_scale.x
+            half_h = height / 2 / screen_scale.y
+        bounds = (position.x - half_w, position.y - half_h, position.x + half_w, position.y + half_h)
+        collider = obj.get_component(Collider)
+        if collider is not None:
+            aabb = collider.get_aabb()
+            if aabb is not None:
+                bounds = aabb_union(bounds, aabb)
+        return bounds
+
+    def cull_objects(self, objects, view):
+        """視界 view と描画範囲の AABB が重なるオブジェクトだけを返す (個別判定)"""
+        screen_scale = self.get_world_to_screen_scale()
+        return [obj for obj in objects if aabb_overlap(view, self.get_world_bounds(obj, screen_scale))]
+
+    def cull_floor(self, floor, view):
+        """
+        フロアの描画リストのうち視界 view と重なるオブジェクトを描画順で返す
+        - コライダーを持つオブジェクトはブロードフェーズ (空間インデックス) の query_aabb で判定
+          (コストは視界内のオブジェクト数に比例)
+          スプライトはコライダーより大きく描かれることがあるので、視界を最大のスプライトの半分 (ワールド座標に換算) だけ広げて検索
+        - インデックスにないオブジェクト (コライダーなし・AABB 未計算) は描画範囲の AABB で個別に判定
+        """
+        entries = floor.render_entries
+        visible = {}  # {オブジェクト: 描画順のキー} (複数のコライダーを持つオブジェクトは 1 回だけ)
+        screen_scale = self.get_world_to_screen_scale()
+        half_extent = Sprite.transform_cache.max_extent / 2
+        pad_x, pad_y = half_extent / screen_scale.x, half_extent / screen_scale.y
+        indexed_view = (view[0] - pad_x, view[1] - pad_y, view[2] + pad_x, view[3] + pad_y)
+        for collider in floor.physics_engine.broad_phase.query_aabb(indexed_view):
+            obj = collider.game_object
+            key = entries.get(obj)
+            if key is None or obj in visible:
+                continue
+            # コライダーが視界外なら、スプライトを含めた描画範囲で判定し直す (広げた分の余計な描画をしない)
+            aabb = collider.get_aabb()
+            if (aabb is not None and aabb_overlap(view, aabb)) or aabb_overlap(view, self.get_world_bounds(obj, screen_scale)):
+                visible[obj] = key
+        for obj in self.cull_objects(floor.get_unindexed_render_objects(), view):
+            visible[obj] = entries[obj]
+        return sorted(visible, key=visible.get)
+
     def set_zoom(self, new_zoom):
         """ズーム倍率を変更"""
         self.zoom = max(0.1, new_zoom)  # **0.1 未満にならないように制限**
@@ -151,28 +253,69 @@ class Camera(GameObject):
         """Layerクラスを継承したものを追加"""
         self.layers.append(layer)
 
+    def get_layer_order(self):
+        """(背景レイヤー, 近景レイヤー) を parallax_factor 順で返す (レイヤーが変わったときだけ並べ直す)"""
+        key = tuple((id(layer), layer.parallax_factor) for layer in self.layers)
+        if self._layer_order[0] != key:
+            ordered = sorted(self.layers, key=lambda l: l.parallax_factor)
+            self._layer_order = (
+                key,
+                [layer for layer in ordered if layer.parallax_factor <= 1.0],
+                [layer for layer in ordered if layer.parallax_factor > 1.0],
+            )
+        return self._layer_order[1], self._layer_order[2]
+
+    def get_render_target(self):
+        """描画先の Surface (サイズが変わったときだけ作り直し、それ以外は透明でクリアして再利用)"""
+        size = self.view_canvas_size.size
+        if self.render_target is None or self.render_target.get_size() != size:
+            self.render_target = pygame.Surface(size, pygame.SRCALPHA)
+        else:
+            self.render_target.fill((0, 0, 0, 0))
+        return self.render_target
+
     def render_scene(self, screen):
         if not self.active:
             return
 
-        camera_surface = pygame.Surface(self.view_canvas_size.size, pygame.SRCALPHA)
+        camera_surface = self.get_render_target()
+        background_layers, foreground_layers = self.get_layer_order()
 
         # ✅ **1. 背景レイヤー (parallax_factor <= 1.0) を先に描画**
-        for layer in sorted(self.layers, key=lambda l: l.parallax_factor):
-            if layer.parallax_factor <= 1.0:
-                layer.render(camera_surface, self)
+        for layer in background_layers:
+            layer.render(camera_surface, self)
 
-        # 2️⃣ 各フロアごとのオブジェクト描画
-        for floor_level in sorted(self.floor_objects.keys(), reverse=False):  # ✅ 下の階から描画
+        # 2️⃣ 各フロアごとのオブジェクト描画 (視界外のオブジェクトは座標変換も描画もしない)
+        view = self.get_view_aabb(self.cull_margin) if self.culling else None
+        self.drawn_count = self.culled_count = 0
+        queue = self.render_queue
+        queue.begin_frame()
+        scale_x, scale_y, offset_x, offset_y = self.get_screen_mapping()  # **座標変換はフレームで 1 回だけ計算**
+        for floor_level in self.get_render_levels():  # ✅ 下の階から描画
             scale = self.get_floor_scale(floor_level)
-            for obj in self.floor_objects[floor_level]:
+            floor = self.floors.get(floor_level)
+            objects = floor.render_list if floor is not None else []  # **フロアが整列済みの描画リスト**
+            extra = list(self.floor_objects.get(floor_level, ()))
+            total = len(objects) + len(extra)
+            if view is not None:
+                objects = self.cull_floor(floor, view) if floor is not None else []
+                extra = self.cull_objects(extra, view)
+                self.culled_count += total - len(objects) - len(extra)
+            if extra:
+                objects = objects + extra
+            for obj in objects:
                 if obj.visible:
-                    screen_pos = self.world_to_screen(obj.transform.global_position)
-                    obj.render(camera_surface, screen_pos, scale=scale)  # ✅ スケール適用
+                    position = obj.transform.get_interpolated_position()
+                    screen_pos = pygame.Vector2(position.x * scale_x + offset_x, position.y * scale_y + offset_y)
+                    if self.batching:
+                        obj.submit_render(queue, camera_surface, screen_pos, scale, floor_level)
+                    else:
+                        obj.render(camera_surface, screen_pos, scale=scale)  # ✅ スケール適用
+                    self.drawn_count += 1
+        queue.flush(camera_surface)  # **積まれたスプライトをフロア・レイヤー順にまとめて描画**
 
         # ✅ **3. 近景レイヤー (parallax_factor > 1.0) を後に描画**
-        for layer in sorted(self.layers, key=lambda l: l.parallax_factor):
-            if layer.parallax_factor > 1.0:
-                layer.render(camera_surface, self)
+        for layer in foreground_layers:
+            layer.render(camera_surface, self)
 
         screen.blit(camera_surface, self.view_canvas_size.topleft)
@@ -1,5 +1,8 @@
 class Component:
     """GameObjectに付与できるコンポーネントの基底クラス"""
+    # **__slots__** (__slots__ を宣言しないサブクラスは従来どおり __dict__ を持つ)
+    __slots__ = ("game_object", "enabled", "__weakref__")
+
     def __init__(self, game_object):
         self.game_object = game_object  # このコンポーネントを持つGameObject
         self.enabled = True  # コンポーネントが有効かどうか
@@ -16,6 +19,9 @@ class Component:
         """描画処理 (オーバーライド用)"""
         if not self.enabled:
             return False
+    def submit(self, queue, screen_pos, scale, floor_level=0):
+        """描画コマンドを RenderQueue に積む (積んだら True・積まないコンポーネントは render で直接描画)"""
+        return False
     def handle_event(self, event):
         """イベントを処理 (オーバーライド用)"""
         pass
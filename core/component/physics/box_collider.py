@@ -4,8 +4,8 @@ import pygame
 
 class BoxCollider(Collider):
     """矩形 (AABB) のコライダー"""
-    def __init__(self, game_object, width, height, offset=pygame.Vector2(0, 0)):
-        super().__init__(game_object)
+    def __init__(self, game_object, width, height, offset=pygame.Vector2(0, 0), layer=Collider.DEFAULT_LAYER, mask=Collider.ALL_LAYERS, is_trigger=False):
+        super().__init__(game_object, layer, mask, is_trigger)
         self.width = width
         self.height = height
         self.offset = offset  # **ローカル座標でのオフセット**
@@ -14,3 +14,8 @@ class BoxCollider(Collider):
         """ボックスの AABB 境界を取得"""
         pos = self.game_object.transform.global_position + self.offset
         return pygame.Rect(pos.x, pos.y, self.width, self.height)
+
+    def get_aabb(self):
+        """ブロードフェーズ用の AABB (min_x, min_y, max_x, max_y) を取得 (狭域判定と同じく左上基準)"""
+        pos = self.game_object.transform.global_position
+        return (pos.x, pos.y, pos.x + self.width, pos.y + self.height)
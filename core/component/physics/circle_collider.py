@@ -4,11 +4,17 @@ from math import sqrt
 import pygame
 class CircleCollider(Collider):
     """円のコライダー"""
-    def __init__(self, game_object, radius, offset=pygame.Vector2(0, 0)):
-        super().__init__(game_object)
+    def __init__(self, game_object, radius, offset=pygame.Vector2(0, 0), layer=Collider.DEFAULT_LAYER, mask=Collider.ALL_LAYERS, is_trigger=False):
+        super().__init__(game_object, layer, mask, is_trigger)
         self.radius = radius
         self.offset = offset  # **ローカル座標でのオフセット**
 
     def get_center(self):
         """円の中心座標を取得"""
         return self.game_object.transform.global_position + self.offset
+
+    def get_aabb(self):
+        """円を囲む AABB (min_x, min_y, max_x, max_y) を取得 (狭域判定と同じくグローバル座標基準)"""
+        pos = self.game_object.transform.global_position
+        r = self.radius
+        return (pos.x - r, pos.y - r, pos.x + r, pos.y + r)
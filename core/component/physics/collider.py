@@ -4,6 +4,44 @@ from core.component.physics.rigidbody import RigidBody
 
 class Collider(Component):
     """すべてのコライダーの基底クラス"""
-    def __init__(self, game_object):
+    DEFAULT_LAYER = 1          # 既定の所属レイヤー (ビット)
+    ALL_LAYERS = 0xFFFFFFFF    # すべてのレイヤーと衝突するマスク
+
+    def __init__(self, game_object, layer=DEFAULT_LAYER, mask=ALL_LAYERS, is_trigger=False):
+        """
+        :param layer: 所属するレイヤーのビット (0 なら物理演算に参加しない)
+        :param mask: 衝突する相手レイヤーのビットマスク
+        :param is_trigger: True なら衝突解決をせず、重なりの開始・終了イベントだけを通知 (センサー)
+        """
         super().__init__(game_object)
-        self.rigid_body = game_object.get_component(RigidBody)  # **Rigidbody 参照**
\ No newline at end of file
+        self.rigid_body = game_object.get_component(RigidBody)  # **Rigidbody 参照**
+        self.layer = layer
+        self.mask = mask
+        self.is_trigger = is_trigger
+
+    def set_layer(self, layer=None, mask=None):
+        """レイヤー・マスクを変更し、登録先の物理エンジンに反映"""
+        if layer is not None:
+            self.layer = layer
+        if mask is not None:
+            self.mask = mask
+        for engine in self.game_object.physics_engines:
+            engine.refresh_collider(self)
+
+    def set_trigger(self, is_trigger):
+        """トリガー (センサー) にするか設定し、登録先の物理エンジンに反映"""
+        self.is_trigger = is_trigger
+        for engine in self.game_object.physics_engines:
+            engine.refresh_collider(self)
+
+    def is_in_physics(self):
+        """いずれかのレイヤーと衝突しうるか (False ならブロードフェーズに登録しない)"""
+        return self.layer != 0 and self.mask != 0
+
+    def can_collide_with(self, other):
+        """レイヤー・マスクの両方向が一致するか"""
+        return (self.layer & other.mask) != 0 and (other.layer & self.mask) != 0
+
+    def get_aabb(self):
+        """ブロードフェーズ用の AABB (min_x, min_y, max_x, max_y) を取得 (オーバーライド用)"""
+        return None
@@ -5,6 +5,8 @@ class PhysicsMaterial:
     """
     物理マテリアル: 衝突時の反発係数と摩擦係数を定義するクラス
     """
+    __slots__ = ("friction", "restitution")
+
     def __init__(self, friction=0.5, restitution=0.5):
         """
         :param friction: 摩擦係数 (0: 完全滑らか, 1: 高摩擦)
@@ -17,14 +19,20 @@ class RigidBody(Component):
     """物理オブジェクト (重力・速度・衝突解決)"""
     STATIC = 0
     DYNAMIC = 1
+    # **__slots__** (積分・力の適用は velocity / acceleration を in-place で更新する)
+    __slots__ = (
+        "mass", "inv_mass", "velocity", "acceleration", "gravity", "is_static", "physics_material", "max_speed",
+        "def_on_collision_enter", "def_on_collision_exit", "current_collisions", "previous_collisions",
+        "simulated_by_engine", "can_sleep", "sleeping", "sleep_counter", "is_bullet", "ccd_origin"
+    )
 
-    def __init__(self, game_object, mass=1, gravity=pygame.Vector2(0, 9.8), is_static=False, friction=0.5, restitution=0.5, def_on_collision_enter=None, def_on_collision_exit=None):
+    def __init__(self, game_object, mass=1, gravity=pygame.Vector2(0, 9.8), is_static=False, friction=0.5, restitution=0.5, def_on_collision_enter=None, def_on_collision_exit=None, is_bullet=False):
         super().__init__(game_object)
         self.mass = 0 if is_static else mass
         self.inv_mass = 0 if self.mass == 0 else 1 / self.mass  # **逆質量 (静的オブジェクトは 0)**
         self.velocity = pygame.Vector2(0, 0)
         self.acceleration = pygame.Vector2(0, 0)
-        self.gravity = gravity if not is_static else pygame.Vector2(0, 0)
+        self.gravity = pygame.Vector2(gravity) if not is_static else pygame.Vector2(0, 0)
         self.is_static = is_static
         self.physics_material = PhysicsMaterial(friction, restitution)
         self.max_speed = float('inf')  # **最大速度 (default: 無限)**
@@ -33,6 +41,15 @@ class RigidBody(Component):
         # ✅ 衝突管理用のセット
         self.current_collisions = set()  # 今フレームで衝突しているオブジェクト
         self.previous_collisions = set()  # 前フレームで衝突していたオブジェクト
+        # ✅ 物理エンジン側でまとめて積分する場合は True (update での積分を省略)
+        self.simulated_by_engine = False
+        # ✅ スリープ管理 (静止が続いたボディは積分・狭域判定を省略)
+        self.can_sleep = True
+        self.sleeping = False
+        self.sleep_counter = 0  # 速度がしきい値未満だった連続ステップ数
+        # ✅ 連続衝突判定 (高速で動くボディのみ・すり抜け防止)
+        self.is_bullet = is_bullet
+        self.ccd_origin = None  # 前ステップ終了時の位置 (スイープの開始点)
     def on_collision_enter(self, other):
         """コールバック (オプション)"""
         if self.def_on_collision_enter is not None:
@@ -44,19 +61,48 @@ class RigidBody(Component):
     def apply_force(self, force):
         """オブジェクトに力を加える"""
         if not self.is_static:
-            self.acceleration += force * self.inv_mass
-    def check_collision_events(self):
-        """衝突開始・終了イベントを検知"""
+            self.wake_up()
+            self.acceleration.x += force[0] * self.inv_mass
+            self.acceleration.y += force[1] * self.inv_mass
+    def set_bullet(self, is_bullet):
+        """連続衝突判定の対象にするか設定"""
+        self.is_bullet = is_bullet
+        self.ccd_origin = None
+        for engine in self.game_object.physics_engines:
+            engine.refresh_bullet(self)
+    def is_awake(self):
+        """積分・衝突判定の対象となる動的ボディか"""
+        return not self.is_static and not self.sleeping
+    def sleep(self):
+        """スリープさせる (速度・加速度をリセット)"""
+        self.sleeping = True
+        self.velocity.update(0, 0)
+        self.acceleration.update(0, 0)
+    def wake_up(self):
+        """スリープを解除"""
+        self.sleeping = False
+        self.sleep_counter = 0
+    def check_collision_events(self, deferred=None):
+        """
+        衝突開始・終了イベントを検知
+        :param deferred: リストを渡すとコールバックを呼ばずに (callback, args, kwargs) を追加する (並列ステップ用)
+        """
         # ✅ 衝突終了を検出
         for obj in self.previous_collisions - self.current_collisions:
-            self.on_collision_exit(obj)
+            if deferred is not None:
+                deferred.append((self.on_collision_exit, (obj,), {}))
+            else:
+                self.on_collision_exit(obj)
 
         # ✅ 衝突開始を検出
         for obj in self.current_collisions - self.previous_collisions:
-            self.on_collision_enter(obj)
+            if deferred is not None:
+                deferred.append((self.on_collision_enter, (obj,), {}))
+            else:
+                self.on_collision_enter(obj)
 
-        # 衝突情報を更新
-        self.previous_collisions = self.current_collisions.copy()
+        # 衝突情報を更新 (セットを入れ替えて使い回す)
+        self.previous_collisions, self.current_collisions = self.current_collisions, self.previous_collisions
         self.current_collisions.clear()
     def apply_move_force(self, move_force, max_speed):
         """
@@ -74,11 +120,25 @@ class RigidBody(Component):
 
     def update(self, delta_time):
         """物理計算 (速度・位置更新)"""
+        if self.simulated_by_engine:
+            return  # **物理エンジンが積分を担当**
+        self.integrate(delta_time)
+
+    def integrate(self, delta_time):
+        """速度・位置を delta_time だけ進める"""
         if self.is_static:
             return  # **静的オブジェクトは動かない**
+        if self.sleeping:
+            # スリープ中に速度が直接書き換えられた場合は起こす
+            if self.velocity.x == 0 and self.velocity.y == 0:
+                return
+            self.wake_up()
 
-        # **重力適用**
-        self.velocity += self.gravity * delta_time
-        self.velocity += self.acceleration * delta_time
-        self.game_object.transform.local_position += self.velocity * delta_time
-        self.acceleration = pygame.Vector2(0, 0)  # **加速度リセット**
\ No newline at end of file
+        # **重力適用** (一時ベクトルを作らないよう成分ごとに in-place 更新)
+        velocity, acceleration, gravity = self.velocity, self.acceleration, self.gravity
+        velocity.x += (gravity.x + acceleration.x) * delta_time
+        velocity.y += (gravity.y + acceleration.y) * delta_time
+        position = self.game_object.transform.local_position
+        position.x += velocity.x * delta_time
+        position.y += velocity.y * delta_time
+        acceleration.update(0, 0)  # **加速度リセット**
\ No newline at end of file
@@ -2,10 +2,12 @@ import pygame
 import math
 from core.component.component import Component
 from core.component.transform import Transform
+from core.component.sprite_cache import SpriteCache
 
 class Sprite(Component):
     """カメラによる描画を前提とした 2D スプライトコンポーネント"""
     image_cache = {}  # 画像キャッシュ
+    transform_cache = SpriteCache()  # **拡大縮小・回転済みの画像のキャッシュ (全スプライトで共有)**
 
     def __init__(self, game_object, image_path, layer=0, base_size=None):
         """
@@ -29,6 +31,8 @@ class Sprite(Component):
         # 画像ロード
         self.original_image = None
         self.transformed_image = None
+        self.transform_state = None  # 変換に使った (元画像, スケール x, スケール y, 回転)
+        self.center_offset = (None, 0, 0)  # (画像, 幅 // 2, 高さ // 2) (submit で中心合わせに使う)
         self.load_image()
 
     def load_image(self):
@@ -53,19 +57,19 @@ class Sprite(Component):
         self.update_transform()
 
     def update_transform(self):
-        """Transform 情報を基にスプライトを変換"""
+        """Transform 情報を基にスプライトを変換 (スケール・回転が変わったときだけ・結果は全スプライトで共有)"""
         scale = self.transform.get_render_scale()
         rotation = self.transform.get_render_rotation().z  # Z軸回転（2D）
+        state = (self.original_image, scale.x, scale.y, rotation)
+        if state == self.transform_state:
+            return
+        self.transform_state = state
 
-        # スケーリング
-        scaled_image = pygame.transform.scale(
-            self.original_image,
-            (int(self.original_image.get_width() * scale.x), int(self.original_image.get_height() * scale.y))
+        # スケーリング → 回転
+        self.transformed_image = Sprite.transform_cache.get(
+            self.image_path, self.original_image, scale.x, scale.y, rotation
         )
 
-        # 回転
-        self.transformed_image = pygame.transform.rotate(scaled_image, -rotation)
-
     def render(self, surface, screen_position, scale):
         """カメラから呼び出されて描画を実行"""
         if not self.transformed_image:
@@ -73,3 +77,17 @@ class Sprite(Component):
 
         rect = self.transformed_image.get_rect(center=(int(screen_position.x), int(screen_position.y)))
         surface.blit(self.transformed_image, rect)
+
+    def submit(self, queue, screen_position, scale, floor_level=0):
+        """描画コマンドを RenderQueue に積む (render と同じく画像の中心を screen_position に合わせる)"""
+        image = self.transformed_image
+        if image:
+            offset_image, half_w, half_h = self.center_offset
+            if offset_image is not image:
+                width, height = image.get_size()
+                half_w, half_h = width // 2, height // 2
+                self.center_offset = (image, half_w, half_h)
+            queue.submit_centered(
+                image, int(screen_position.x), int(screen_position.y), half_w, half_h, self.layer, floor_level
+            )
+        return True
@@ -0,0 +1,97 @@
+from collections import OrderedDict
+import pygame
+
+# ------------------------------
+# 変換済みスプライトの LRU キャッシュ (Sprite.transform_cache)
+# ------------------------------
+
+class SpriteCache:
+    """
+    拡大縮小・回転済みの Surface を (画像パス, 元サイズ, 量子化したスケール, 量子化した回転) で共有する LRU キャッシュ
+    - 同じ画像・同じスケールのスプライト (食べ物やヘビの体など) は 1 枚の Surface を使い回す
+    - Surface の合計バイト数が max_bytes を超えたら、最も長く使われていないものから捨てる
+    """
+    def __init__(self, max_bytes=64 * 1024 * 1024, scale_step=0.01, rotation_step=1.0):
+        """
+        :param max_bytes: キャッシュする Surface の合計バイト数の上限
+        :param scale_step: スケールの量子化の刻み
+        :param rotation_step: 回転 (度数法) の量子化の刻み
+        """
+        self.max_bytes = max_bytes
+        self.scale_step = scale_step
+        self.rotation_step = rotation_step
+        self.entries = OrderedDict()  # {キー: Surface} (末尾が最近使ったもの)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.max_extent = 0  # 作った Surface の最大の辺 [px] (カメラのカリングの余白用・clear までは縮めない)
+
+    def make_key(self, image_path, image, scale_x, scale_y, rotation):
+        """量子化したキー (画像パスが同じでも元サイズが違えば別の画像として扱う)"""
+        scale_step, rotation_step = self.scale_step, self.rotation_step
+        return (
+            image_path, image.get_width(), image.get_height(),
+            round(scale_x / scale_step), round(scale_y / scale_step),
+            round((rotation % 360) / rotation_step) % round(360 / rotation_step)
+        )
+
+    def get(self, image_path, image, scale_x, scale_y, rotation):
+        """変換済みの Surface を返す (なければ作ってキャッシュ)"""
+        key = self.make_key(image_path, image, scale_x, scale_y, rotation)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        # 量子化した値で変換 (キーが同じなら見た目も同じになる)
+        quantized_x = key[3] * self.scale_step
+        quantized_y = key[4] * self.scale_step
+        scaled = pygame.transform.scale(
+            image, (max(0, int(image.get_width() * quantized_x)), max(0, int(image.get_height() * quantized_y)))
+        )
+        surface = pygame.transform.rotate(scaled, -key[5] * self.rotation_step)
+
+        self.entries[key] = surface
+        self.bytes += self._size_of(surface)
+        self.max_extent = max(self.max_extent, surface.get_width(), surface.get_height())
+        self._evict()
+        return surface
+
+    @staticmethod
+    def _size_of(surface):
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def _evict(self):
+        """上限を超えていたら古いものから捨てる (直前に追加した 1 枚は残す)"""
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            _, surface = self.entries.popitem(last=False)
+            self.bytes -= self._size_of(surface)
+            self.evictions += 1
+
+    def set_budget(self, max_bytes):
+        """メモリ上限を変更"""
+        self.max_bytes = max_bytes
+        self._evict()
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+        self.max_extent = 0
+
+    def reset_stats(self):
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """ヒット数・ミス数などの辞書 (デバッグ表示用)"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
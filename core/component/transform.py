@@ -8,11 +8,26 @@ class Transform(Component):
     - position: pygame.Vector2
     - scale: pygame.Vector2
     - rotation: pygame.Vector3 (2Dゲームの場合は rotation.z を回転角に使うことが多い)
+    - 大量のオブジェクト向けに __slots__ で __dict__ を持たず、update_transform はベクトルを in-place で更新する
+    - ダーティフラグ: ローカル値も親も変わっていなければ update_transform は何もしない
+      (local_position は物理演算などで in-place に書き換えられるため、前回の値との比較で変化を検出する)
+    - TransformStore に登録されている場合、グローバル値はストアの一括計算で更新される
     """
-    def __init__(self, game_object, local_position=(0, 0), local_scale=(1, 1), local_rotation=(0, 0, 0), parent=None):
+    __slots__ = (
+        "parent", "local_position", "local_scale", "local_rotation",
+        "global_position", "global_scale", "global_rotation", "screen_position",
+        "interpolation_source", "previous_position",
+        "version", "_dirty", "_parent_version", "_last_position", "_last_scale", "_last_rotation",
+        "_trig_angle", "_cos", "_sin", "store"
+    )
+
+    def __init__(self, game_object, local_position=(0, 0), local_scale=(1, 1), local_rotation=(0, 0, 0), parent=None, position=None):
+        """
+        :param position: local_position の別名 (position を渡すゲームコードとの互換用)
+        """
         super().__init__(game_object)
         self.parent = parent
-        self.local_position = pygame.Vector2(local_position)
+        self.local_position = pygame.Vector2(local_position if position is None else position)
         self.local_scale = pygame.Vector2(local_scale)
         self.local_rotation = pygame.Vector3(local_rotation)  # 2Dゲームでは z成分を使用
 
@@ -21,31 +36,107 @@ class Transform(Component):
         self.global_rotation = pygame.Vector3(0, 0, 0)
 
         self.screen_position = pygame.Vector2(0, 0)
+
+        # ✅ 固定ステップ物理の描画補間 (物理エンジンが設定する)
+        self.interpolation_source = None  # interpolation_alpha を持つ物理エンジン
+        self.previous_position = None     # 直前の物理ステップでのグローバル位置
+
+        # ✅ ダーティフラグ (グローバル値が変わるたびに version を進め、子は親の version で変化を検出)
+        self.version = 0
+        self._dirty = True
+        self._parent_version = -1
+        self._last_position = pygame.Vector2()   # 前回計算したときのローカル値
+        self._last_scale = pygame.Vector2()
+        self._last_rotation = pygame.Vector3()
+        self._trig_angle = 0.0  # cos / sin を計算したグローバル回転 (z)
+        self._cos = 1.0
+        self._sin = 0.0
+        self.store = None  # 登録先の TransformStore (None なら update_transform で個別に計算)
+    @property
+    def position(self):
+        """local_position の別名"""
+        return self.local_position
+
+    @position.setter
+    def position(self, value):
+        self.local_position.update(value)
+
+    def mark_dirty(self):
+        """次の update_transform で必ず再計算させる (子孫は親の version の変化で再計算される)"""
+        self._dirty = True
+
+    def rotation_cos_sin(self):
+        """グローバル回転 (z・度数法) の cos / sin (回転が変わったときだけ再計算)"""
+        angle = self.global_rotation.z
+        if angle != self._trig_angle:
+            angle_rad = math.radians(angle)
+            self._cos = math.cos(angle_rad)
+            self._sin = math.sin(angle_rad)
+            self._trig_angle = angle
+        return self._cos, self._sin
+
     def update_transform(self):
-        """現在の位置をlocalからglobalに更新する"""
-        if self.parent:
-            self.global_scale = pygame.Vector2(self.parent.global_scale.x * self.local_scale.x, self.parent.global_scale.y * self.local_scale.y)
-            self.global_rotation = self.parent.global_rotation + self.local_rotation
-            rotated_local_position = self._rotate_vector(self.local_position, self.parent.global_rotation)
-            self.global_position = self.parent.global_position + rotated_local_position
-        else:
+        """現在の位置をlocalからglobalに更新する (変化がなければ何もしない・新しいベクトルは作らない)"""
+        if self.store is not None and not self._dirty:
+            return  # **TransformStore がオブジェクトの更新のあとに一括計算する**
+        parent = self.parent
+        if parent is None:
+            # 親なしは local と同じベクトルを共有 (local_position が差し替えられても追従する)
             self.global_position = self.local_position
             self.global_scale = self.local_scale
             self.global_rotation = self.local_rotation
+            parent_version = 0
+        else:
+            parent_version = parent.version
+        if (not self._dirty and parent_version == self._parent_version
+                and self.local_position == self._last_position
+                and self.local_scale == self._last_scale
+                and self.local_rotation == self._last_rotation):
+            return  # **変化なし**
+        self._dirty = False
+        self._parent_version = parent_version
+        self._last_position.update(self.local_position)
+        self._last_scale.update(self.local_scale)
+        self._last_rotation.update(self.local_rotation)
+        self.version += 1
+        if parent:
+            # 親なしの間は local と同じベクトルを共有しているので、親ができたら一度だけ分離する
+            if self.global_position is self.local_position:
+                self.global_position = pygame.Vector2()
+            if self.global_scale is self.local_scale:
+                self.global_scale = pygame.Vector2()
+            if self.global_rotation is self.local_rotation:
+                self.global_rotation = pygame.Vector3()
+            local_scale, parent_scale = self.local_scale, parent.global_scale
+            self.global_scale.update(parent_scale.x * local_scale.x, parent_scale.y * local_scale.y)
+            parent_rotation, local_rotation = parent.global_rotation, self.local_rotation
+            self.global_rotation.update(
+                parent_rotation.x + local_rotation.x, parent_rotation.y + local_rotation.y, parent_rotation.z + local_rotation.z
+            )
+            # **親の回転 (z 成分・度数法) でローカル位置を回転** (cos / sin は親ごとにキャッシュ)
+            cos_a, sin_a = parent.rotation_cos_sin()
+            local, parent_position = self.local_position, parent.global_position
+            self.global_position.update(
+                parent_position.x + local.x * cos_a - local.y * sin_a,
+                parent_position.y + local.x * sin_a + local.y * cos_a
+            )
     def update_screen_transform(self, camera):
         """カメラの描写範囲を基準にスクリーントランスフォームを更新"""
         self.screen_position = camera.world_to_screen(self.global_position)
     def set_local_position(self, new_local_position):
         """親オブジェクト基準のローカル位置を更新"""
         self.local_position = pygame.Vector2(new_local_position)
+        self._dirty = True
         self.update_transform()
     def set_local_scale(self, new_local_scale):
         """親オブジェクト基準のスケールを更新"""
         self.local_scale = pygame.Vector2(new_local_scale)
+        self._dirty = True
         self.update_transform()
     def set_local_rotation(self, new_local_rotation):
         """親オブジェクト基準の回転を更新"""
-        self.local_rotation = pygame.Vector2(new_local_rotation)
+        self.local_rotation = pygame.Vector3(new_local_rotation)
+        self._dirty = True
         self.update_transform()
 
     def get_local_position(self):
@@ -55,9 +146,19 @@ class Transform(Component):
     def get_global_position(self):
         """グローバル位置を取得"""
         return self.global_position
+    def get_interpolated_position(self):
+        """描画用のグローバル位置 (固定ステップ物理なら前ステップとの間を補間)"""
+        if self.interpolation_source is None or self.previous_position is None:
+            return self.global_position
+        return self.previous_position.lerp(self.global_position, self.interpolation_source.interpolation_alpha)
     def set_parent(self, parent):
         """ `RectTransform` を設定"""
         self.parent = parent
+        self._dirty = True
+        if self.store is not None:
+            self.store.invalidate()
+        elif parent is not None and parent.store is not None:
+            parent.store.add(self)  # 親がストアで管理されていれば子も一括計算に含める
         self.update_transform()
     def get_render_position(self):
         """描画に使用するスクリーン座標を取得"""
@@ -0,0 +1,119 @@
+from core.component.component import Component
+
+# ------------------------------
+# 型ごとのコンポーネント配列とキャッシュ付きクエリ (ECS 風のストレージ)
+# ------------------------------
+
+class ComponentStorage:
+    """
+    コンポーネントを型ごとの密な配列で保持し、「(Transform, RigidBody, CircleCollider) をすべて持つオブジェクト」
+    のようなクエリの結果をキャッシュする
+    - コンポーネントは具象クラスと基底クラス (Collider など) の両方の型で登録する
+    - GameObject.add_component / remove_component から通知を受けて更新 (毎フレームの探索は不要)
+    - クエリの結果は関係する型の配列が変わったときだけ作り直す
+    """
+    def __init__(self):
+        self.pools = {}      # {型: [コンポーネント]} (密な配列・削除は末尾と入れ替え)
+        self.slots = {}      # {型: {コンポーネント: 配列の添字}}
+        self.owners = {}     # {型: {GameObject: コンポーネント}} (同じ型が複数あれば先に登録されたもの)
+        self.versions = {}   # {型: 変更回数}
+        self.queries = {}    # {型のタプル: (変更回数のタプル, 結果)}
+        self.objects = set()
+
+    _type_cache = {}  # {具象クラス: 登録に使う型のリスト}
+
+    @classmethod
+    def _types(cls, component):
+        """登録に使う型 (Component 自身と object を除く継承階層)"""
+        component_class = type(component)
+        types = cls._type_cache.get(component_class)
+        if types is None:
+            types = [t for t in component_class.__mro__ if t is not Component and t is not object]
+            cls._type_cache[component_class] = types
+        return types
+
+    # ✅ オブジェクトの登録
+    def add_object(self, game_object):
+        if game_object in self.objects:
+            return
+        self.objects.add(game_object)
+        game_object.component_storages.append(self)
+        for component in game_object.components.values():
+            self.add(component)
+
+    def remove_object(self, game_object):
+        if game_object not in self.objects:
+            return
+        self.objects.remove(game_object)
+        game_object.component_storages.remove(self)
+        for component in game_object.components.values():
+            self.remove(component)
+
+    # ✅ コンポーネントの登録
+    def add(self, component):
+        for cls in self._types(component):
+            slots = self.slots.setdefault(cls, {})
+            if component in slots:
+                continue
+            pool = self.pools.setdefault(cls, [])
+            slots[component] = len(pool)
+            pool.append(component)
+            self.owners.setdefault(cls, {}).setdefault(component.game_object, component)
+            self.versions[cls] = self.versions.get(cls, 0) + 1
+
+    def remove(self, component):
+        for cls in self._types(component):
+            slots = self.slots.get(cls)
+            if not slots or component not in slots:
+                continue
+            # **末尾の要素を空いた位置へ移して配列を詰める**
+            pool = self.pools[cls]
+            slot = slots.pop(component)
+            last = pool.pop()
+            if last is not component:
+                pool[slot] = last
+                slots[last] = slot
+            owners = self.owners[cls]
+            if owners.get(component.game_object) is component:
+                del owners[component.game_object]
+                # 同じオブジェクトに同じ型のコンポーネントが残っていれば引き継ぐ (探すのはそのオブジェクトのコンポーネントだけ)
+                for other in component.game_object.components.values():
+                    if isinstance(other, cls) and other is not component and other in slots:
+                        owners[component.game_object] = other
+                        break
+            self.versions[cls] += 1
+
+    # ✅ 参照
+    def components(self, component_class):
+        """その型 (基底クラスを含む) のコンポーネントの配列 (読み取り専用として使う)"""
+        return self.pools.get(component_class, [])
+
+    def get(self, game_object, component_class):
+        """オブジェクトが持つその型のコンポーネント (なければ None)"""
+        return self.owners.get(component_class, {}).get(game_object)
+
+    def query(self, *component_classes):
+        """
+        すべての型を持つオブジェクトごとのコンポーネントのタプルのリスト (型の順)
+        例: for transform, rb, collider in storage.query(Transform, RigidBody, CircleCollider): ...
+        """
+        versions = tuple(self.versions.get(cls, 0) for cls in component_classes)
+        cached = self.queries.get(component_classes)
+        if cached is not None and cached[0] == versions:
+            return cached[1]
+
+        # **最も少ない型の配列から探す**
+        owners = [self.owners.get(cls, {}) for cls in component_classes]
+        smallest = min(owners, key=len)
+        result = []
+        for game_object in smallest:
+            row = tuple(owner.get(game_object) for owner in owners)
+            if None not in row:
+                result.append(row)
+        self.queries[component_classes] = (versions, result)
+        return result
+
+    def clear(self):
+        for game_object in list(self.objects):
+            self.remove_object(game_object)
+        self.queries.clear()
@@ -0,0 +1,152 @@
+import math
+import pygame
+from core.component.physics.rigidbody import RigidBody
+
+# ------------------------------
+# 接触キャッシュ＋逐次インパルス法による衝突解決
+# ------------------------------
+
+class Contact:
+    """コライダーペアの接触情報 (フレームをまたいで蓄積インパルスを保持)"""
+    def __init__(self, collider1, collider2, rb1, rb2):
+        self.collider1 = collider1
+        self.collider2 = collider2
+        self.rb1 = rb1
+        self.rb2 = rb2
+        self.manifold = None
+        self.normal = pygame.Vector2()  # 前回の法線 (マニフォールドはプールで使い回されることがあるため値で保持)
+        self.normal_impulse = 0.0   # 法線方向の蓄積インパルス (>= 0)
+        self.tangent_impulse = 0.0  # 接線方向 (摩擦) の蓄積インパルス
+        self.normal_mass = 0.0
+        self.friction = 0.0
+        self.velocity_bias = 0.0    # 反発による目標分離速度
+
+class ContactSolver:
+    """
+    接触キャッシュを使った逐次インパルス法のソルバー
+    - コライダーペアごとに前フレームの蓄積インパルスを保持し、ウォームスタートに使う
+    - 法線インパルスと摩擦 (PhysicsMaterial.friction) を指定回数だけ反復して解く
+    """
+    def __init__(self, iterations=8, warm_starting=True, restitution_threshold=1.0, percent=0.8, slop=0.01):
+        """
+        :param iterations: 速度の反復回数
+        :param warm_starting: 前フレームの蓄積インパルスから解き始めるか
+        :param restitution_threshold: これより遅い衝突では反発させない (静止接触の振動防止)
+        :param percent: 位置補正の割合
+        :param slop: 位置補正で許容する食い込み量
+        """
+        self.iterations = iterations
+        self.warm_starting = warm_starting
+        self.restitution_threshold = restitution_threshold
+        self.percent = percent
+        self.slop = slop
+        self.cache = {}          # {(collider1, collider2): Contact}
+        self.contact_count = 0   # 直近で解いた接触数
+        self.warm_started = 0    # そのうちキャッシュから引き継いだ接触数
+
+    def clear(self):
+        """接触キャッシュを破棄"""
+        self.cache.clear()
+
+    def solve(self, manifolds):
+        """
+        狭域判定の結果 [(collider1, collider2, manifold)] をまとめて解決
+        (今回接触していないペアはキャッシュから取り除く)
+        """
+        contacts = self._prepare(manifolds)
+        if self.warm_starting:
+            for contact in contacts:
+                self._apply_impulse(contact, contact.normal_impulse, contact.tangent_impulse)
+        for _ in range(self.iterations):
+            for contact in contacts:
+                self._solve_velocity(contact)
+        for contact in contacts:
+            self._correct_position(contact)
+        self.contact_count = len(contacts)
+
+    def _prepare(self, manifolds):
+        """キャッシュとの照合・有効質量と反発速度の計算"""
+        cache = {}
+        contacts = []
+        self.warm_started = 0
+        for collider1, collider2, manifold in manifolds:
+            rb1 = collider1.game_object.get_component(RigidBody)
+            rb2 = collider2.game_object.get_component(RigidBody)
+            if rb1 is None or rb2 is None:
+                continue
+            inv_mass_sum = rb1.inv_mass + rb2.inv_mass
+            if inv_mass_sum == 0:
+                continue  # 静的同士は解決不要
+
+            key = (collider1, collider2)
+            contact = self.cache.get(key)
+            if contact is not None and contact.manifold is not None and contact.normal.dot(manifold.normal) > 0.9:
+                self.warm_started += 1
+            else:
+                # 新しい接触、または法線が大きく変わった接触はインパルスを 0 から解く
+                contact = Contact(collider1, collider2, rb1, rb2)
+            contact.manifold = manifold
+            contact.normal.update(manifold.normal)
+            contact.normal_mass = 1 / inv_mass_sum
+            contact.friction = math.sqrt(rb1.physics_material.friction * rb2.physics_material.friction)
+
+            vel_along_normal = (rb2.velocity - rb1.velocity).dot(manifold.normal)
+            restitution = min(rb1.physics_material.restitution, rb2.physics_material.restitution)
+            contact.velocity_bias = -restitution * vel_along_normal if vel_along_normal < -self.restitution_threshold else 0.0
+
+            # ✅ 衝突中のオブジェクトとして登録
+            rb1.current_collisions.add(rb2)
+            rb2.current_collisions.add(rb1)
+
+            cache[key] = contact
+            contacts.append(contact)
+        self.cache = cache
+        return contacts
+
+    @staticmethod
+    def _apply_impulse(contact, normal_impulse, tangent_impulse):
+        """法線・接線インパルスを両ボディに適用"""
+        normal = contact.manifold.normal
+        impulse_x = normal.x * normal_impulse - normal.y * tangent_impulse
+        impulse_y = normal.y * normal_impulse + normal.x * tangent_impulse
+        v1, v2 = contact.rb1.velocity, contact.rb2.velocity
+        inv1, inv2 = contact.rb1.inv_mass, contact.rb2.inv_mass
+        v1.x -= impulse_x * inv1
+        v1.y -= impulse_y * inv1
+        v2.x += impulse_x * inv2
+        v2.y += impulse_y * inv2
+
+    def _solve_velocity(self, contact):
+        """1 接触分の摩擦 → 法線インパルスを解く (蓄積インパルスをクランプ)"""
+        normal = contact.manifold.normal
+        v1, v2 = contact.rb1.velocity, contact.rb2.velocity
+
+        # **摩擦** (|接線インパルス| <= 摩擦係数 × 法線インパルス・接線は (-ny, nx))
+        lambda_t = -((v2.x - v1.x) * -normal.y + (v2.y - v1.y) * normal.x) * contact.normal_mass
+        max_friction = contact.friction * contact.normal_impulse
+        new_impulse = max(-max_friction, min(contact.tangent_impulse + lambda_t, max_friction))
+        lambda_t = new_impulse - contact.tangent_impulse
+        contact.tangent_impulse = new_impulse
+
+        # **法線** (蓄積インパルスは押し合う方向のみ)
+        vel_along_normal = (v2.x - v1.x) * normal.x + (v2.y - v1.y) * normal.y
+        lambda_n = -(vel_along_normal - contact.velocity_bias) * contact.normal_mass
+        new_impulse = max(contact.normal_impulse + lambda_n, 0.0)
+        lambda_n = new_impulse - contact.normal_impulse
+        contact.normal_impulse = new_impulse
+
+        self._apply_impulse(contact, lambda_n, lambda_t)
+
+    def _correct_position(self, contact):
+        """食い込みの位置補正 (resolve_collision と同じ式)"""
+        rb1, rb2 = contact.rb1, contact.rb2
+        manifold = contact.manifold
+        magnitude = max(manifold.penetration - self.slop, 0) * contact.normal_mass * self.percent
+        if magnitude == 0:
+            return
+        cx, cy = manifold.normal.x * magnitude, manifold.normal.y * magnitude
+        p1, p2 = rb1.game_object.transform.local_position, rb2.game_object.transform.local_position
+        p1.x -= cx * rb1.inv_mass
+        p1.y -= cy * rb1.inv_mass
+        p2.x += cx * rb2.inv_mass
+        p2.y += cy * rb2.inv_mass
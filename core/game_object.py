@@ -1,6 +1,7 @@
 import pygame
 from core.event_manager import EventManager
 from core.coroutine import CoroutineManager
+from core.component.component import Component
 from core.component.transform import Transform
 class GameObject:
     """親子関係を持つ GameObject クラス"""
@@ -15,6 +16,10 @@ class GameObject:
         self.current_collisions = set()
 
         self.floor = 0
+        self.physics_engines = []  # **このオブジェクトを登録している物理エンジン**
+        self.component_storages = []  # **このオブジェクトを登録している ComponentStorage**
+        self._component_cache = {}  # **get_component の基底クラス探索の結果 {クラス: コンポーネント}**
+        self._render_components = None  # **描画するコンポーネント (render / submit を実装しているもの)**
 
         # **デフォルトで Transform を追加**
         self.transform = self.add_component(Transform, parent=parent.transform if parent else None)
@@ -65,18 +70,48 @@ class GameObject:
     def add_component(self, component_class, *args, **kwargs):
         """コンポーネントを追加"""
         component = component_class(self, *args, **kwargs)
+        previous = self.components.get(component_class.__name__)
         self.components[component_class.__name__] = component
+        self._component_cache.clear()
+        self._render_components = None
+        # ✅ 物理エンジン・ComponentStorage に登録済みなら、追加・置き換えを通知
+        for engine in self.physics_engines:
+            if previous is not None:
+                engine.unregister_component(previous)
+            engine.register_component(component)
+        for storage in self.component_storages:
+            if previous is not None:
+                storage.remove(previous)
+            storage.add(component)
+        return component
+
+    def remove_component(self, component_class):
+        """コンポーネントを削除"""
+        component = self.components.pop(component_class.__name__, None)
+        if component is not None:
+            self._component_cache.clear()
+            self._render_components = None
+            for engine in self.physics_engines:
+                engine.unregister_component(component)
+            for storage in self.component_storages:
+                storage.remove(component)
         return component
 
     def get_component(self, component_class):
         if component_class.__name__ in self.components:
             return self.components[component_class.__name__]
 
-        # キャッシュされていない場合、基底クラスも含めて探索
+        # 基底クラスも含めて探索 (結果はコンポーネントが追加・削除されるまでキャッシュ)
+        cache = self._component_cache
+        if component_class in cache:
+            return cache[component_class]
+        found = None
         for comp in self.components.values():
             if isinstance(comp, component_class):
-                return comp
-        return None
+                found = comp
+                break
+        cache[component_class] = found
+        return found
 
 
     def on_collision_enter(self, other):
@@ -141,3 +176,31 @@ class GameObject:
             component.render(surface, screen_pos, scale)
         for child in self.children:
             child.render(surface, screen_pos, scale)
+
+    def get_render_components(self):
+        """描画するコンポーネント (render / submit を実装しているもの・コンポーネントが変わるまでキャッシュ)"""
+        components = self._render_components
+        if components is None:
+            components = self._render_components = [
+                component for component in self.components.values()
+                if type(component).submit is not Component.submit or type(component).render is not Component.render
+            ]
+        return components
+
+    def submit_render(self, queue, surface, screen_pos, scale, floor_level=0):
+        """
+        描画コマンドを RenderQueue に積む (Camera の一括描画用)
+        - 積めないコンポーネント・render を独自に実装したオブジェクトは、キューを flush してから直接描画する
+        """
+        if type(self).render is not GameObject.render:
+            queue.flush(surface)
+            self.render(surface, screen_pos, scale)
+            return
+        for component in self.get_render_components():
+            if component.submit(queue, screen_pos, scale, floor_level):
+                continue
+            if type(component).render is not Component.render:
+                queue.flush(surface)
+                component.render(surface, screen_pos, scale)
+        for child in self.children:
+            child.submit_render(queue, surface, screen_pos, scale, floor_level)
@@ -1,14 +1,47 @@
+from bisect import bisect_left
 from core.physics_engine import PhysicsEngine
+from core.component.sprite import Sprite
+from core.component.physics.collider import Collider
+from core.component_storage import ComponentStorage
 
 class Floor:
-    def __init__(self, name, level):
+    def __init__(self, name, level, broad_phase=None):
+        """
+        :param broad_phase: このフロアの物理エンジンが使うブロードフェーズ (None なら空間ハッシュ)
+        """
         self.name = name
         self.level = level                # 高さのレベル (例: 1階, 2階)
         self.objects = set()              # **オブジェクトをセットで管理 (重複防止)**
         self.transitional_objects = set() # **中間オブジェクトもセットで管理**
         self.scale_factor = 1.0           # デフォルトは 1.0 (通常サイズ)
         self.scene = None
-        self.physics_engine = PhysicsEngine()
+        self.physics_engine = PhysicsEngine(broad_phase)
+        self.transform_store = None       # **Transform の一括計算 (set_transform_store で有効化)**
+        self.components = ComponentStorage()  # **型ごとのコンポーネント配列 (components.query で検索)**
+
+        # ✅ 描画リスト (フロアへの出入りのときだけ更新・レイヤー順に整列済み)
+        self.render_list = []     # 描画順のオブジェクト
+        self.render_keys = []     # render_list と同じ順の (レイヤー, 登録順)
+        self.render_entries = {}  # {オブジェクト: (レイヤー, 登録順)}
+        self.render_version = 0   # 描画リストが変わるたびに増える
+        self._render_sequence = 0
+        self._unindexed_cache = (None, [])  # (キャッシュのキー, コライダーで検索できないオブジェクト)
+
+    # ✅ Transform の一括計算
+    def set_transform_store(self, enabled=True):
+        """
+        フロア上のオブジェクト (子孫を含む) の Transform を TransformStore で一括計算するか設定
+        - 大きな階層を持つシーン向け (NumPy が必要)
+        """
+        if self.transform_store is not None:
+            for obj in self.objects | self.transitional_objects:
+                self.transform_store.remove(obj.transform)
+            self.transform_store = None
+        if enabled:
+            from core.transform_store import TransformStore
+            self.transform_store = TransformStore()
+            for obj in self.objects | self.transitional_objects:
+                self.transform_store.add(obj.transform)
 
     # ✅ オブジェクト追加
     def add_object(self, game_object):
@@ -16,39 +49,133 @@ class Floor:
             game_object._apply_floor(self.level)
             self.objects.add(game_object)
             game_object.set_scene(self.scene)
+            self.physics_engine.add_object(game_object)
+            self.components.add_object(game_object)
+            if self.transform_store is not None:
+                self.transform_store.add(game_object.transform)
+            self.sync_render(game_object)
 
     # ✅ オブジェクト削除
     def remove_object(self, game_object):
         if game_object in self.objects:
             self.objects.remove(game_object)
+            if game_object not in self.transitional_objects:
+                self.physics_engine.remove_object(game_object)
+                self.components.remove_object(game_object)
+                if self.transform_store is not None:
+                    self.transform_store.remove(game_object.transform)
+            self.sync_render(game_object)
 
     # ✅ 中間オブジェクト追加
     def add_transitional_object(self, game_object):
         if game_object not in self.transitional_objects:
             self.transitional_objects.add(game_object)
+            self.physics_engine.add_object(game_object)
+            self.components.add_object(game_object)
+            if self.transform_store is not None:
+                self.transform_store.add(game_object.transform)
+            self.sync_render(game_object)
 
     # ✅ 中間オブジェクト削除
     def remove_transitional_object(self, game_object):
         if game_object in self.transitional_objects:
             self.transitional_objects.remove(game_object)
+            if game_object not in self.objects:
+                self.physics_engine.remove_object(game_object)
+                self.components.remove_object(game_object)
+                if self.transform_store is not None:
+                    self.transform_store.remove(game_object.transform)
+            self.sync_render(game_object)
 
     # ✅ 更新処理
     def update(self, delta_time):
-        # 物理エンジンの更新
-        self.physics_engine.update_scene(list(self.objects | self.transitional_objects))
+        self.step_physics(delta_time)
+        self.update_objects(delta_time)
+
+    def step_physics(self, delta_time):
+        # 物理エンジンの更新 (登録は add_object / remove_object 時に行う)
         self.physics_engine.update(delta_time)
 
-        # オブジェクトの更新
+    def update_objects(self, delta_time, updated=None):
+        """
+        オブジェクトの更新
+        :param updated: 更新済みオブジェクトのセット (渡すと複数フロアにまたがる中間オブジェクトを 1 回だけ更新)
+        """
         for obj in self.objects | self.transitional_objects:
+            if updated is not None:
+                if obj in updated:
+                    continue
+                updated.add(obj)
             obj.update(delta_time)
+        if self.transform_store is not None:
+            # **コンポーネントによる移動を含めて階層全体のグローバル値を一括計算 (描画の前)**
+            self.transform_store.update()
     def handle_event(self, event):
         pass
 
+    # ✅ 描画リスト
+    @staticmethod
+    def get_render_layer(game_object):
+        """描画レイヤー (Sprite.layer・スプライトがなければ 0)"""
+        sprite = game_object.get_component(Sprite)
+        return sprite.layer if sprite is not None else 0
+
+    def sync_render(self, game_object):
+        """
+        オブジェクトの描画リストへの登録をフロアへの所属に合わせる
+        - このフロアのオブジェクト・中間オブジェクトのうち、floor がこのレベル以上のものを描画 (中間層は下の階で描画)
+        """
+        should_render = (
+            (game_object in self.objects or game_object in self.transitional_objects)
+            and game_object.floor >= self.level
+        )
+        if should_render and game_object not in self.render_entries:
+            key = (self.get_render_layer(game_object), self._render_sequence)
+            self._render_sequence += 1
+            index = bisect_left(self.render_keys, key)
+            self.render_keys.insert(index, key)
+            self.render_list.insert(index, game_object)
+            self.render_entries[game_object] = key
+            self.render_version += 1
+        elif not should_render and game_object in self.render_entries:
+            index = bisect_left(self.render_keys, self.render_entries.pop(game_object))
+            del self.render_keys[index]
+            del self.render_list[index]
+            self.render_version += 1
+
+    def refresh_render_order(self, game_object):
+        """描画レイヤー (Sprite.layer) を変更したオブジェクトを並べ直す"""
+        if game_object in self.render_entries:
+            index = bisect_left(self.render_keys, self.render_entries.pop(game_object))
+            del self.render_keys[index]
+            del self.render_list[index]
+        self.sync_render(game_object)
+
+    def get_unindexed_render_objects(self):
+        """
+        描画リストのうちブロードフェーズで検索できないオブジェクト (コライダーなし・AABB 未計算)
+        - 描画リスト・コライダーの登録・ブロードフェーズの登録が変わったときだけ作り直す
+        """
+        broad_phase = self.physics_engine.broad_phase
+        key = (
+            self.render_version, self.components.versions.get(Collider, 0),
+            broad_phase._next_id, len(broad_phase.proxies)
+        )
+        if self._unindexed_cache[0] != key:
+            owners = self.components.owners.get(Collider, {})
+            proxies = broad_phase.proxies
+            unindexed = []
+            for obj in self.render_list:
+                proxy = proxies.get(owners.get(obj))
+                if proxy is None or proxy.aabb is None:
+                    unindexed.append(obj)
+            self._unindexed_cache = (key, unindexed)
+        return self._unindexed_cache[1]
+
     # ✅ 描画処理
     def render(self, camera, is_lower_floor=False):
-        for obj in self.objects | self.transitional_objects:
-            if obj.visible and obj.floor >= self.level:
-               camera.register_object(obj, self.level)
+        """カメラにこのフロアの描画リストを登録 (オブジェクトごとの登録は不要)"""
+        camera.register_floor(self)
     def start(self):
         for obj in self.objects | self.transitional_objects:
             if hasattr(obj, "start"):
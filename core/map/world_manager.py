@@ -1,14 +1,81 @@
+from concurrent.futures import ThreadPoolExecutor
 from core.map.floor import Floor
 class WorldManager:
     def __init__(self, scene):
         self.scene = scene
         self.floors = [] # 一階や二階など
+        self.parallel = False   # **フロアごとの物理を並列にステップするか**
+        self.executor = None
 
     # === Floor 管理 ===
     def add_floor(self, floor):
         self.floors.append(floor)
         floor.scene = self.scene
+        if self.parallel:
+            floor.physics_engine.deferred_events = []
+            self._warn_pure_python([floor])
         return floor
+
+    # === 並列ステップ ===
+    def set_parallel(self, enabled=True, max_workers=None):
+        """
+        フロアごとの物理ステップ (積分・衝突判定) をスレッドプールで並列に実行するか設定
+        - 中間オブジェクトを共有するフロア同士は同じワーカーでレベル順に実行
+        - 衝突・トリガーのコールバックはワーカーでは呼ばず、全フロアの完了後にフロア順で呼ぶ
+        - **速くなるのは NumPy バックエンド (`NumpyPhysicsBackend`) のフロアだけ**
+          (純 Python のフロアは GIL を取り合うため、スレッドに分けても 1 コア分しか進まない)
+        :param max_workers: ワーカー数 (None なら CPU 数に応じて自動)
+        """
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        self.parallel = enabled
+        if enabled:
+            self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="floor_physics")
+        for floor in self.floors:
+            engine = floor.physics_engine
+            engine.flush_deferred_events()
+            engine.deferred_events = [] if enabled else None
+        if enabled:
+            self._warn_pure_python(self.floors)
+
+    @staticmethod
+    def _warn_pure_python(floors):
+        """並列ステップの効果がない (NumPy バックエンドを使わない) フロアを知らせる"""
+        names = [floor.name for floor in floors if floor.physics_engine.backend is None]
+        if names:
+            print(f"⚠ 純 Python の物理エンジンのフロアは並列ステップで速くなりません (GIL): {', '.join(names)}")
+
+    def _physics_groups(self):
+        """中間オブジェクトで物理を共有するフロアをまとめる (各グループはフロア順)"""
+        parent = list(range(len(self.floors)))
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+        owner = {}
+        for i, floor in enumerate(self.floors):
+            for obj in floor.transitional_objects:
+                owner.setdefault(obj, i)
+        for i, floor in enumerate(self.floors):
+            for obj in floor.objects:
+                j = owner.get(obj)
+                if j is not None and find(i) != find(j):
+                    parent[find(i)] = find(j)
+            for obj in floor.transitional_objects:
+                j = owner[obj]
+                if find(i) != find(j):
+                    parent[find(i)] = find(j)
+        groups = {}
+        for i, floor in enumerate(self.floors):
+            groups.setdefault(find(i), []).append(floor)
+        return list(groups.values())
+
+    @staticmethod
+    def _step_group(floors, delta_time):
+        for floor in floors:
+            floor.step_physics(delta_time)
     def get_floor(self, floor):
         if isinstance(floor, Floor):
             return self.floors.get(floor)
@@ -19,8 +86,27 @@ class WorldManager:
 
     def update(self, delta_time):
         # すべての Floor と Layer を更新
+        if not self.parallel:
+            for floor in self.floors:
+                floor.update(delta_time)
+            return
+
+        # ✅ 独立したフロアの物理を並列にステップ (グループが 1 つならワーカーを使わない)
+        groups = self._physics_groups()
+        if len(groups) < 2:
+            for floor in self.floors:
+                floor.step_physics(delta_time)
+        else:
+            futures = [self.executor.submit(self._step_group, group, delta_time) for group in groups]
+            for future in futures:
+                future.result()  # ワーカーの例外はここで送出
+
+        # ✅ 決定的なマージ: フロア順にコールバックを呼び、オブジェクトを 1 回ずつ更新
+        for floor in self.floors:
+            floor.physics_engine.flush_deferred_events()
+        updated = set()
         for floor in self.floors:
-            floor.update(delta_time)
+            floor.update_objects(delta_time, updated)
     def handle_event(self, event):
         # すべての Floor と Layer からイベントを処理
         for floor in self.floors:
@@ -37,4 +123,6 @@ class WorldManager:
     def end(self):
         # === 世界の終了 ===
         for floor in self.floors:
-            floor.end()
\ No newline at end of file
+            floor.end()
+        if self.parallel:
+            self.set_parallel(False)
\ No newline at end of file
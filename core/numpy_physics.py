@@ -0,0 +1,235 @@
+from itertools import chain
+from core.component.physics.rigidbody import RigidBody
+from core.component.physics.circle_collider import CircleCollider
+import time
+
+try:
+    import numpy as np
+except ImportError:  # NumPy がない環境では純 Python の物理演算のみ使用可能
+    np = None
+
+# 位置補正のパラメータ (physics_engine.resolve_collision と同じ値)
+CORRECTION_PERCENT = 0.8
+CORRECTION_SLOP = 0.01
+
+class NumpyPhysicsBackend:
+    """
+    NumPy の構造体配列 (SoA) で RigidBody をまとめて積分し、円同士の衝突を一括で解決するバックエンド
+    - 積分は全ボディを 1 回の配列演算で実行
+    - 円 vs 円 (親を持たないオブジェクト同士) の衝突は一括計算、それ以外のペアは従来の関数で解決
+    - 位置・速度の書き戻しは値が変化したボディのみ
+    - 配列はボディの登録が変わったときだけ確保し直し、毎ステップは同じ配列へ値を読み込む
+    - **効果があるのは円同士の候補ペアが多い場面だけ** (一括解決のため)
+      位置・速度は毎ステップ Transform / RigidBody と配列の間でコピーするので、接触の少ない場面では
+      積分を含めて純 Python と同程度 (ブロードフェーズ・オブジェクトの更新はどちらも同じ)
+    - 物理エンジンに反復ソルバーが設定されている場合、衝突はすべてソルバーで解決
+    - トリガーを含むペアは従来の経路 (PhysicsEngine.resolve_pairs) で重なりだけを記録
+    """
+    integrates_bodies = True  # 物理エンジン側で積分する (RigidBody.update は積分しない)
+
+    def __init__(self):
+        if np is None:
+            raise ImportError("NumpyPhysicsBackend には NumPy が必要です (pip install numpy)")
+        self.bodies = []          # スロット順の RigidBody
+        self.transforms = []      # スロット順の Transform
+        self.slots = {}           # {RigidBody: スロット番号}
+        self.circle_slots = {}    # {CircleCollider: スロット番号} (一括解決できる円のみ)
+        self.dirty = True         # 登録内容が変わったら配列を作り直す
+
+        self.state = np.zeros((0, 6))
+        self.position = self.state[:, 0:2]
+        self.velocity = self.state[:, 2:4]
+        self.acceleration = self.state[:, 4:6]
+        self.gravity = np.zeros((0, 2))
+        self.inv_mass = np.zeros(0)
+        self.restitution = np.zeros(0)
+        self.radius = np.zeros(0)
+        self.dynamic = np.zeros(0, dtype=bool)
+        self.awake = np.zeros(0, dtype=bool)
+
+    def rebuild(self, engine):
+        """登録済みの RigidBody / Collider からスロットと変化しない属性の配列を作り直す"""
+        self.bodies = list(engine.rigidbodies)
+        self.transforms = [rb.game_object.transform for rb in self.bodies]
+        self.slots = {rb: i for i, rb in enumerate(self.bodies)}
+        count = len(self.bodies)
+        self.state = np.zeros((count, 6))  # 列: 位置 x, y・速度 x, y・加速度 x, y (gather で毎ステップ上書き)
+        self.position = self.state[:, 0:2]
+        self.velocity = self.state[:, 2:4]
+        self.acceleration = self.state[:, 4:6]
+
+        self.gravity = np.array([(rb.gravity.x, rb.gravity.y) for rb in self.bodies], dtype=float).reshape(count, 2)
+        self.inv_mass = np.array([rb.inv_mass for rb in self.bodies], dtype=float)
+        self.restitution = np.array([rb.physics_material.restitution for rb in self.bodies], dtype=float)
+        self.dynamic = np.array([not rb.is_static for rb in self.bodies], dtype=bool)
+        self.radius = np.zeros(count)
+
+        self.circle_slots = {}
+        for collider in engine.colliders:
+            if not isinstance(collider, CircleCollider) or collider.is_trigger:
+                continue
+            obj = collider.game_object
+            rb = obj.get_component(RigidBody)
+            # ローカル座標 = グローバル座標 となる親なしオブジェクトのみ一括解決
+            if rb in self.slots and obj.transform.parent is None:
+                slot = self.slots[rb]
+                self.circle_slots[collider] = slot
+                self.radius[slot] = collider.radius
+        self.dirty = False
+
+    def gather(self):
+        """各オブジェクトの位置・速度・加速度を配列へ読み込む (ゲーム側で直接変更されることがあるため毎ステップ)"""
+        bodies = self.bodies
+        count = len(bodies)
+        # Vector2 をそのまま平坦化して既存の配列へ読み込む (成分ごとの属性アクセスやタプルのリストを作らない)
+        vectors = chain.from_iterable(
+            (transform.local_position, rb.velocity, rb.acceleration) for transform, rb in zip(self.transforms, bodies)
+        )
+        self.state[:] = np.fromiter(chain.from_iterable(vectors), dtype=float, count=count * 6).reshape(count, 6)
+        sleeping = np.fromiter((rb.sleeping for rb in bodies), dtype=bool, count=count)
+        # スリープ中でも速度が書き換えられていれば起こす (RigidBody.integrate と同じ扱い)
+        woken = np.flatnonzero(sleeping & np.any(self.velocity != 0, axis=1))
+        for i in woken.tolist():
+            bodies[i].wake_up()
+        sleeping[woken] = False
+        self.awake = ~sleeping & self.dynamic
+
+    def scatter(self, position_before, velocity_before=None):
+        """
+        値が変化したボディだけ Transform.local_position / RigidBody.velocity に書き戻す
+        :param velocity_before: None なら位置だけ書き戻す
+        """
+        bodies = self.bodies
+        transforms = self.transforms
+        indices = np.flatnonzero(np.any(self.position != position_before, axis=1))
+        for i, (x, y) in zip(indices.tolist(), self.position[indices].tolist()):
+            # in-place 更新 (親なしの Transform は global_position と同じベクトルを共有している)
+            transforms[i].local_position.update(x, y)
+        if velocity_before is None:
+            return
+        indices = np.flatnonzero(np.any(self.velocity != velocity_before, axis=1))
+        for i, (x, y) in zip(indices.tolist(), self.velocity[indices].tolist()):
+            bodies[i].velocity.update(x, y)
+
+    def integrate(self, delta_time):
+        """起きている動的ボディを一括で積分 (RigidBody.integrate と同じ式)"""
+        awake = self.awake[:, None]
+        self.velocity += np.where(awake, (self.gravity + self.acceleration) * delta_time, 0.0)
+        self.position += np.where(awake, self.velocity * delta_time, 0.0)
+        # **加速度リセット** (値が残っているボディのみ)
+        for i in np.flatnonzero(np.any(self.acceleration != 0, axis=1) & self.awake).tolist():
+            self.bodies[i].acceleration.update(0, 0)
+
+    def solve_circle_pairs(self, slot_a, slot_b):
+        """円 vs 円の候補ペアを一括で判定・解決し、衝突しているペアの (a, b) スロットを返す"""
+        if len(slot_a) == 0:
+            return slot_a, slot_b
+        # どちらも起きていないペアは判定しない
+        either_awake = self.awake[slot_a] | self.awake[slot_b]
+        slot_a, slot_b = slot_a[either_awake], slot_b[either_awake]
+        delta = self.position[slot_b] - self.position[slot_a]
+        dist = np.hypot(delta[:, 0], delta[:, 1])
+        sum_radii = self.radius[slot_a] + self.radius[slot_b]
+        touching = dist < sum_radii
+
+        # 中心が一致している場合は任意の方向 (1, 0) とする
+        safe_dist = np.where(dist == 0, 1.0, dist)
+        normal = np.where((dist == 0)[:, None], np.array([1.0, 0.0]), delta / safe_dist[:, None])
+        penetration = np.where(dist == 0, sum_radii, sum_radii - dist)
+
+        inv_a = self.inv_mass[slot_a]
+        inv_b = self.inv_mass[slot_b]
+        inv_sum = inv_a + inv_b
+        relative_velocity = self.velocity[slot_b] - self.velocity[slot_a]
+        vel_along_normal = np.einsum("ij,ij->i", relative_velocity, normal)
+        # すでに分離しているペア・両方静的なペアは解決しない
+        resolve = touching & (vel_along_normal <= 0) & (inv_sum > 0)
+        if not resolve.any():
+            return slot_a[:0], slot_b[:0]
+
+        a, b = slot_a[resolve], slot_b[resolve]
+        normal = normal[resolve]
+        inv_a, inv_b, inv_sum = inv_a[resolve], inv_b[resolve], inv_sum[resolve]
+
+        # **反発係数とインパルス** (全ペアを同時に計算して加算)
+        restitution = np.minimum(self.restitution[a], self.restitution[b])
+        impulse = normal * (-(1 + restitution) * vel_along_normal[resolve] / inv_sum)[:, None]
+        np.subtract.at(self.velocity, a, impulse * inv_a[:, None])
+        np.add.at(self.velocity, b, impulse * inv_b[:, None])
+
+        # **位置補正**
+        magnitude = np.maximum(penetration[resolve] - CORRECTION_SLOP, 0) / inv_sum * CORRECTION_PERCENT
+        correction = normal * magnitude[:, None]
+        np.subtract.at(self.position, a, correction * inv_a[:, None])
+        np.add.at(self.position, b, correction * inv_b[:, None])
+        return a, b
+
+    def step(self, engine, delta_time):
+        """積分 → ブロードフェーズ → 円同士の一括解決 → 残りのペアを従来どおり解決"""
+        profiler = engine.profiler
+        if profiler is not None:
+            lap = time.perf_counter()
+        if self.dirty:
+            self.rebuild(engine)
+        self.gather()
+        position_before = self.position.copy()
+        velocity_before = self.velocity.copy()
+        self.integrate(delta_time)
+        # ブロードフェーズは Transform から AABB を読むので先に位置を書き戻す (速度は衝突解決のあとにまとめて)
+        self.scatter(position_before)
+        if profiler is not None:
+            lap = profiler.lap("integration", lap)
+
+        # ✅ 弾丸ボディの連続衝突判定 (Transform を直接補正するので配列も読み直す)
+        engine.sweep_bullets()
+        if engine.ccd_hits:
+            for rb in engine.bullets:
+                slot = self.slots.get(rb)
+                if slot is not None:
+                    position = rb.game_object.transform.local_position
+                    self.position[slot] = (position.x, position.y)
+        position_before = self.position.copy()
+        if profiler is not None:
+            lap = profiler.lap("ccd", lap)
+
+        engine.broad_phase.update()
+        pairs = engine.order_pairs(engine.broad_phase.compute_pairs())
+        if profiler is not None:
+            lap = profiler.lap("broad_phase", lap)
+        engine.pair_tests = len(pairs)
+        engine.skipped_pairs = 0
+        engine.contact_count = 0
+
+        circle_a, circle_b, others = [], [], []
+        circle_slots = self.circle_slots
+        if engine.solver is not None:
+            circle_slots = {}  # 反復ソルバー使用時は全ペアをソルバーに渡す
+        for col1, col2 in pairs:
+            slot1 = circle_slots.get(col1)
+            slot2 = circle_slots.get(col2)
+            if slot1 is None or slot2 is None or slot1 == slot2:
+                others.append((col1, col2))
+            else:
+                circle_a.append(slot1)
+                circle_b.append(slot2)
+
+        circle_a = np.array(circle_a, dtype=int)
+        circle_b = np.array(circle_b, dtype=int)
+        hit_a, hit_b = self.solve_circle_pairs(circle_a, circle_b)
+        engine.skipped_pairs += len(circle_a) - int((self.awake[circle_a] | self.awake[circle_b]).sum())
+        self.scatter(position_before, velocity_before)
+
+        engine.contact_count += len(hit_a)
+        # ✅ 衝突中のオブジェクトとして登録 (イベント用)・触れたスリープ中のボディを起こす
+        bodies = self.bodies
+        for i, j in zip(hit_a.tolist(), hit_b.tolist()):
+            bodies[i].current_collisions.add(bodies[j])
+            bodies[j].current_collisions.add(bodies[i])
+            if bodies[i].sleeping:
+                bodies[i].wake_up()
+            if bodies[j].sleeping:
+                bodies[j].wake_up()
+        if profiler is not None:
+            profiler.lap("narrow_phase", lap)
+
+        engine.resolve_pairs(others)
@@ -2,9 +2,17 @@ from core.component.physics.rigidbody import RigidBody
 from core.component.physics.collider import Collider
 from core.component.physics.rigidbody import RigidBody
 
-from core.physics_function import compute_collision_manifold
+from core.physics_function import (
+    compute_collision_manifold, compute_time_of_impact, RaycastHit, QueryHit, ManifoldPool,
+    distance_to_collider, rect_overlaps_collider, segment_vs_collider
+)
+from core.broad_phase import SpatialHashGrid
+from core.physics_profiler import PhysicsProfiler
 import pygame
 import math
+import hashlib
+import struct
+import time
 from core.component.transform import Transform
 
 # ------------------------------
@@ -20,8 +28,9 @@ def resolve_collision(manifold, collider1, collider2):
     if rb1 is None or rb2 is None:
         return
 
-    relative_velocity = rb2.velocity - rb1.velocity
-    vel_along_normal = relative_velocity.dot(manifold.normal)
+    normal = manifold.normal
+    v1, v2 = rb1.velocity, rb2.velocity
+    vel_along_normal = (v2.x - v1.x) * normal.x + (v2.y - v1.y) * normal.y
     if vel_along_normal > 0:
         return  # すでに分離している場合は解決不要
 
@@ -33,57 +42,647 @@ def resolve_collision(manifold, collider1, collider2):
     restitution = min(rb1.physics_material.restitution, rb2.physics_material.restitution)
     impulse_scalar = -(1 + restitution) * vel_along_normal
     impulse_scalar /= (rb1.inv_mass + rb2.inv_mass)
-    impulse = manifold.normal * impulse_scalar
 
-    # **衝突インパルス適用**
-    rb1.velocity -= impulse * rb1.inv_mass
-    rb2.velocity += impulse * rb2.inv_mass
+    # **衝突インパルス適用** (一時ベクトルを作らず in-place 更新)
+    v1.x -= normal.x * impulse_scalar * rb1.inv_mass
+    v1.y -= normal.y * impulse_scalar * rb1.inv_mass
+    v2.x += normal.x * impulse_scalar * rb2.inv_mass
+    v2.y += normal.y * impulse_scalar * rb2.inv_mass
 
     # **位置補正**
     percent = 0.8
     slop = 0.01
     correction_magnitude = max(manifold.penetration - slop, 0) / (rb1.inv_mass + rb2.inv_mass) * percent
-    correction = manifold.normal * correction_magnitude
-    obj1.transform.local_position -= correction * rb1.inv_mass
-    obj2.transform.local_position += correction * rb2.inv_mass
+    p1, p2 = obj1.transform.local_position, obj2.transform.local_position
+    p1.x -= normal.x * correction_magnitude * rb1.inv_mass
+    p1.y -= normal.y * correction_magnitude * rb1.inv_mass
+    p2.x += normal.x * correction_magnitude * rb2.inv_mass
+    p2.y += normal.y * correction_magnitude * rb2.inv_mass
 
 class PhysicsEngine:
     """ゲームシーンに統合された物理エンジン"""
-    def __init__(self):
-        self.rigidbodies = []  # RigidBody を持つオブジェクト
-        self.colliders = []    # Collider を持つオブジェクト
+    def __init__(self, broad_phase=None, backend=None, step_rate=None, max_substeps=5, solver=None, pool_manifolds=False):
+        """
+        :param broad_phase: 候補ペアを絞り込むブロードフェーズ (None なら `SpatialHashGrid`)
+        :param backend: 積分と衝突解決をまとめて行うバックエンド (例: `NumpyPhysicsBackend`・None なら純 Python)
+        :param step_rate: 固定ステップのレート [回/秒] (None ならフレームの delta_time でそのまま進める)
+        :param max_substeps: 1フレームで実行する固定ステップの上限 (超えた分の時間は切り捨て)
+        :param solver: 接触キャッシュを使う反復ソルバー (例: `ContactSolver`・None ならペアごとに 1 回のインパルス)
+        :param pool_manifolds: True なら CollisionManifold をステップ間で使い回す (接触ごとの確保をなくす)
+        """
+        self.rigidbodies = {}  # 登録済みの RigidBody (登録順を保つため dict をセットとして使用)
+        self.colliders = {}    # 登録済みの Collider
+        self.broad_phase = broad_phase if broad_phase is not None else SpatialHashGrid()
+        self.pair_tests = 0    # 直近のフレームで狭域判定したペア数
+        self.contact_count = 0 # 直近のステップで接触していたペア数 (トリガーを除く)
+        self._pending = []     # 次の update で反映する登録・解除 [(登録するか, component)]
+        self.backend = None
+        self.solver = solver
+        self.manifold_pool = ManifoldPool() if pool_manifolds else None
+        # ✅ 固定ステップ
+        self.fixed_timestep = None    # 1ステップの時間 [秒]
+        self.max_substeps = max_substeps
+        self.accumulator = 0.0        # まだシミュレーションしていない時間
+        self.interpolation_alpha = 1.0  # 描画補間の係数 (前ステップ → 現ステップ)
+        self.step_count = 0           # 実行したステップ数 (リプレイ用)
+        # ✅ スリープ
+        self.enable_sleeping = True
+        self.sleep_velocity = 1.0     # この速度未満が続いたらスリープ候補
+        self.sleep_steps = 60         # スリープまでに必要な連続ステップ数
+        self.awake_count = 0          # 直近ステップで起きている動的ボディ数
+        self.sleeping_count = 0       # 直近ステップでスリープ中のボディ数
+        self.skipped_pairs = 0        # スリープ・静的同士のため狭域判定を省略したペア数
+        # ✅ 連続衝突判定
+        self.bullets = {}             # is_bullet の RigidBody
+        self.ccd_skin = 0.05          # TOI で止めたあと狭域判定で接触を検出させるための食い込み量
+        self.ccd_hits = 0             # 直近ステップで TOI により移動を止めた回数
+        # ✅ トリガー (センサー) の重なり
+        self.trigger_overlaps = set()           # 今ステップで重なっている (collider1, collider2)
+        self.previous_trigger_overlaps = set()  # 前ステップで重なっていたペア
+        self.trigger_batches = 0                # 直近ステップでイベントを通知した GameObject 数
+        self._query_stale = False  # ステップ後にブロードフェーズの AABB を更新していないか (空間クエリ用)
+        # ✅ 並列ステップ用: リストなら衝突・トリガーのコールバックを溜め、flush_deferred_events でまとめて呼ぶ
+        self.deferred_events = None
+        # ✅ 決定論モード (ロックステップ・ロールバック用)
+        self.deterministic = False
+        self.fixed_point_bits = None  # 位置・速度を 2^-bits 単位に丸める (None なら丸めない)
+        self._stable_keys = {}        # {RigidBody / Collider: 並び順のキー}
+        self._registration_count = 0
+        # ✅ フェーズ別の計測 (None なら計測しない)
+        self.profiler = None
+        self.set_backend(backend)
+        self.set_step_rate(step_rate, max_substeps)
 
-    def update_scene(self, objects):
-        """シーン内のすべてのオブジェクトから Rigidbody と Collider を自動検出"""
-        self.rigidbodies.clear()
-        self.colliders.clear()
+    def set_broad_phase(self, broad_phase):
+        """ブロードフェーズを差し替え (登録済みのコライダーは引き継ぐ)"""
+        self.broad_phase.clear()
+        self.broad_phase = broad_phase
+        self.broad_phase.sync([col for col in self.colliders if col.is_in_physics()])
 
-        for obj in objects:
-            # **Rigidbody の登録**
-            rb = obj.get_component(RigidBody)
-            if rb:
-                self.rigidbodies.append(rb)
+    def set_backend(self, backend):
+        """積分・衝突解決のバックエンドを差し替え (None で純 Python に戻す)"""
+        self.backend = backend
+        for rb in self.rigidbodies:
+            self._attach_body(rb)
+        if backend is not None:
+            backend.dirty = True
+
+    def set_step_rate(self, step_rate, max_substeps=None):
+        """固定ステップのレートを設定 (None で可変ステップに戻す)"""
+        self.fixed_timestep = None if step_rate is None else 1.0 / step_rate
+        if max_substeps is not None:
+            self.max_substeps = max_substeps
+        self.accumulator = 0.0
+        self.interpolation_alpha = 1.0
+        for rb in self.rigidbodies:
+            self._attach_body(rb)
+
+    def enable_profiling(self, capacity=300):
+        """フェーズ別の計測を開始 (記録は `profiler` の PhysicsProfiler から読む)"""
+        if self.profiler is None:
+            self.profiler = PhysicsProfiler(capacity)
+        return self.profiler
+
+    def disable_profiling(self):
+        """計測を停止"""
+        self.profiler = None
+
+    def set_deterministic(self, enabled=True, fixed_point_bits=None, step_rate=60):
+        """
+        決定論モードを設定 (同じ入力なら別マシンでも同じ状態になる)
+        - ボディ・コライダー・候補ペアをネットワーク ID (なければ登録順) で並べて処理
+        - 固定ステップ必須・処理落ちしても時間を切り捨てない (ステップ数が経過時間だけで決まる)
+        :param fixed_point_bits: 指定するとステップごとに位置・速度を 2^-bits 単位の固定小数点値に丸める
+        :param step_rate: 固定ステップが未設定の場合に使うレート [回/秒]
+        """
+        self.deterministic = enabled
+        self.fixed_point_bits = fixed_point_bits if enabled else None
+        if enabled:
+            if self.fixed_timestep is None:
+                self.set_step_rate(step_rate)
+            self.flush_registry()
+            self._sort_registry()
+
+    def _stable_key(self, component):
+        """並び順のキー (ネットワーク ID を持つオブジェクトが先、それ以外は登録順)"""
+        key = self._stable_keys.get(component)
+        if key is None:
+            network_id = getattr(component.game_object, "network_id", None)
+            key = (0, network_id, self._registration_count) if network_id is not None else (1, 0, self._registration_count)
+            self._registration_count += 1
+            self._stable_keys[component] = key
+        return key
+
+    def _sort_registry(self):
+        """登録済みの RigidBody / Collider を安定キー順に並べ直す"""
+        self.rigidbodies = dict.fromkeys(sorted(self.rigidbodies, key=self._stable_key))
+        self.colliders = dict.fromkeys(sorted(self.colliders, key=self._stable_key))
+        self.bullets = dict.fromkeys(sorted(self.bullets, key=self._stable_key))
+        if self.backend is not None:
+            self.backend.dirty = True
+
+    def order_pairs(self, pairs):
+        """決定論モードなら候補ペアを安定キー順に並べる (ブロードフェーズ内部の順序に依存させない)"""
+        if not self.deterministic:
+            return pairs
+        key = self._stable_key
+        ordered = []
+        for col1, col2 in pairs:
+            if key(col2) < key(col1):
+                col1, col2 = col2, col1
+            ordered.append((col1, col2))
+        ordered.sort(key=lambda pair: (key(pair[0]), key(pair[1])))
+        return ordered
+
+    def quantize_state(self):
+        """位置・速度を固定小数点の格子に丸める (in-place 更新)"""
+        scale = float(1 << self.fixed_point_bits)
+        for rb in self.rigidbodies:
+            position = rb.game_object.transform.local_position
+            position.update(round(position.x * scale) / scale, round(position.y * scale) / scale)
+            rb.velocity.update(round(rb.velocity.x * scale) / scale, round(rb.velocity.y * scale) / scale)
+
+    def state_hash(self):
+        """
+        全 RigidBody の状態 (位置・速度・スリープ) のハッシュ値 (16 進文字列)
+        - リプレイや別マシンとの比較用・並び順は安定キー順
+        """
+        digest = hashlib.sha256()
+        for rb in sorted(self.rigidbodies, key=self._stable_key):
+            position = rb.game_object.transform.local_position
+            digest.update(struct.pack("<4d?", position.x, position.y, rb.velocity.x, rb.velocity.y, rb.sleeping))
+        return digest.hexdigest()
+
+    def _integrates_bodies(self):
+        """RigidBody の積分を物理エンジン側で行うか"""
+        if self.fixed_timestep is not None:
+            return True
+        return self.backend is not None and self.backend.integrates_bodies
+
+    def _attach_body(self, rb):
+        """RigidBody の積分・描画補間の担当を設定"""
+        rb.simulated_by_engine = self._integrates_bodies()
+        self.refresh_bullet(rb)
+        transform = rb.game_object.transform
+        if self.fixed_timestep is not None:
+            transform.interpolation_source = self
+            transform.update_transform()  # 生成直後はグローバル値が未計算 (原点) のまま
+            transform.previous_position = pygame.Vector2(transform.global_position)
+        else:
+            transform.interpolation_source = None
+
+    def _detach_body(self, rb):
+        """RigidBody の担当を解除"""
+        rb.simulated_by_engine = False
+        self.bullets.pop(rb, None)
+        if rb.game_object.transform.interpolation_source is self:
+            rb.game_object.transform.interpolation_source = None
+
+    def refresh_bullet(self, rb):
+        """RigidBody.is_bullet に合わせて CCD 対象を更新"""
+        if rb.is_bullet and rb in self.rigidbodies:
+            self.bullets[rb] = None
+        else:
+            self.bullets.pop(rb, None)
+
+    def refresh_collider(self, collider):
+        """Collider のレイヤー・マスク・トリガー設定の変更を反映 (0 になったらブロードフェーズから外す)"""
+        if collider not in self.colliders:
+            return
+        if self.backend is not None:
+            self.backend.dirty = True  # 一括解決の対象が変わる
+        if not collider.is_in_physics():
+            self.broad_phase.remove(collider)
+        elif collider in self.broad_phase.proxies:
+            self.broad_phase.refresh_filter(collider)
+        else:
+            self.broad_phase.add(collider)
+
+    # ** 登録管理 (変更があったときだけ呼ばれる) **
+    def add_object(self, game_object):
+        """GameObject の RigidBody / Collider を登録し、以降の add_component も追跡する"""
+        if self in game_object.physics_engines:
+            return
+        game_object.physics_engines.append(self)
+        for component in list(game_object.components.values()):
+            self.register_component(component)
+
+    def remove_object(self, game_object):
+        """GameObject の RigidBody / Collider の登録を解除"""
+        if self not in game_object.physics_engines:
+            return
+        game_object.physics_engines.remove(self)
+        for component in list(game_object.components.values()):
+            self.unregister_component(component)
 
-            # **Collider の登録**
-            col = obj.get_component(Collider)
-            if col:
-                self.colliders.append(col)
+    def register_component(self, component):
+        """RigidBody / Collider を登録予約 (それ以外は無視)"""
+        if isinstance(component, (RigidBody, Collider)):
+            self._pending.append((True, component))
+
+    def unregister_component(self, component):
+        """RigidBody / Collider の登録解除を予約 (それ以外は無視)"""
+        if isinstance(component, (RigidBody, Collider)):
+            self._pending.append((False, component))
+
+    def flush_registry(self):
+        """予約された登録・解除を反映 (衝突コールバック中の追加・削除にも対応するため遅延させる)"""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        for is_add, component in pending:
+            registry = self.rigidbodies if isinstance(component, RigidBody) else self.colliders
+            if is_add:
+                if component not in registry:
+                    registry[component] = None
+                    if registry is self.colliders:
+                        if component.is_in_physics():
+                            self.broad_phase.add(component)
+                    else:
+                        self._attach_body(component)
+            elif component in registry:
+                del registry[component]
+                self._stable_keys.pop(component, None)
+                if registry is self.colliders:
+                    self.broad_phase.remove(component)
+                else:
+                    self._detach_body(component)
+        if self.deterministic:
+            self._sort_registry()
+        elif self.backend is not None:
+            self.backend.dirty = True
+
+    def update_scene(self, objects):
+        """オブジェクト一覧と登録内容を一致させる (差分のみ登録・解除)"""
+        objects = list(objects)
+        current = set(objects)
+        for component in list(self.rigidbodies) + list(self.colliders):
+            obj = component.game_object
+            if obj not in current and self in obj.physics_engines:
+                self.remove_object(obj)
+        for obj in objects:
+            self.add_object(obj)
+        self.flush_registry()
 
     def update(self, delta_time):
-        """物理エンジンの更新 (重力・衝突処理)"""
+        """物理エンジンの更新 (固定ステップなら溜まった時間分だけステップを実行)"""
+        if self.profiler is not None:
+            start = time.perf_counter()
+            self.flush_registry()
+            self.profiler.lap("registry", start)
+        else:
+            self.flush_registry()
+        if self.fixed_timestep is None:
+            self.step(delta_time)
+            return
+
+        self.accumulator += delta_time
+        substeps = 0
+        while self.accumulator >= self.fixed_timestep and substeps < self.max_substeps:
+            # ✅ 描画補間用に直前の位置を保存 (グローバル値は obj.update より前なので先に計算しておく)
+            for rb in self.rigidbodies:
+                transform = rb.game_object.transform
+                transform.update_transform()
+                transform.previous_position.update(transform.global_position)
+            self.step(self.fixed_timestep)
+            self.accumulator -= self.fixed_timestep
+            substeps += 1
+        if self.accumulator >= self.fixed_timestep and not self.deterministic:
+            # 上限を超えた分は切り捨て (処理落ち時に遅れが雪だるま式に増えるのを防ぐ)
+            self.accumulator %= self.fixed_timestep
+        self.interpolation_alpha = self.accumulator / self.fixed_timestep
+
+    def step(self, delta_time):
+        """物理を 1 ステップ進める (積分・衝突判定と解決・衝突イベント)"""
+        profiler = self.profiler
+        if profiler is not None:
+            step_start = lap = time.perf_counter()
+        if self.manifold_pool is not None:
+            self.manifold_pool.release_all()  # 前ステップのマニフォールドを再利用
         # **衝突判定と解決**
-        self.resolve_collisions()
-        # ✅ 衝突イベントの更新
+        if self.backend is not None:
+            self.backend.step(self, delta_time)  # 積分もまとめて実行
+        else:
+            if self.fixed_timestep is not None:
+                for rb in self.rigidbodies:
+                    rb.integrate(delta_time)
+            if profiler is not None:
+                profiler.lap("integration", lap)
+            self.resolve_collisions()
+        if profiler is not None:
+            lap = time.perf_counter()
+        # ✅ 次のステップのスイープ開始点を記録
+        for rb in self.bullets:
+            rb.ccd_origin = pygame.Vector2(rb.game_object.transform.global_position)
+        # ✅ 衝突イベントの更新 (スリープ中のボディは接触状態を保持)
+        for rb in self.rigidbodies:
+            if not rb.sleeping:
+                rb.check_collision_events(self.deferred_events)
+        if profiler is not None:
+            lap = profiler.lap("events", lap)
+        self.update_sleep()
+        if self.fixed_point_bits is not None:
+            self.quantize_state()
+        if profiler is not None:
+            lap = profiler.lap("sleep", lap)
+        self.dispatch_trigger_events()
+        self.step_count += 1
+        self._query_stale = True  # 衝突解決・位置補正で動いた分はクエリの前に反映する
+        if profiler is not None:
+            profiler.lap("events", lap)
+            profiler.end_step(self, step_start)
+
+    def dispatch_trigger_events(self):
+        """
+        トリガーの重なりの開始・終了をまとめ、GameObject ごとに 1 回だけ通知
+        - イベント名は "on_trigger" (entered: 重なり始めた相手の Collider リスト, exited: 離れた相手のリスト)
+        """
+        current, previous = self.trigger_overlaps, self.previous_trigger_overlaps
+        self.previous_trigger_overlaps = current
+        self.trigger_overlaps = set()
+        if current == previous:
+            self.trigger_batches = 0
+            return
+        batches = {}  # {GameObject: ([entered], [exited])}
+        began, ended = current - previous, previous - current
+        if self.deterministic:
+            began, ended = self.order_pairs(began), self.order_pairs(ended)
+        for col1, col2 in began:
+            batches.setdefault(col1.game_object, ([], []))[0].append(col2)
+            batches.setdefault(col2.game_object, ([], []))[0].append(col1)
+        for col1, col2 in ended:
+            batches.setdefault(col1.game_object, ([], []))[1].append(col2)
+            batches.setdefault(col2.game_object, ([], []))[1].append(col1)
+        self.trigger_batches = len(batches)
+        for game_object, (entered, exited) in batches.items():
+            if self.deferred_events is not None:
+                self.deferred_events.append((game_object.event_manager.trigger_event, ("on_trigger",), {"entered": entered, "exited": exited}))
+            else:
+                game_object.event_manager.trigger_event("on_trigger", entered=entered, exited=exited)
+
+    def flush_deferred_events(self):
+        """溜めておいた衝突・トリガーのコールバックを発生順に呼ぶ"""
+        if not self.deferred_events:
+            return
+        events, self.deferred_events = self.deferred_events, []
+        for callback, args, kwargs in events:
+            callback(*args, **kwargs)
+
+    def update_sleep(self):
+        """
+        静止が続いたボディをスリープさせる
+        - 接触しているボディ同士 (アイランド) は全員が静止したときだけまとめてスリープ
+        - スリープ中に速度が書き換えられたボディは起こす
+        """
+        limit = self.sleep_velocity ** 2
+        awake = []
+        sleeping = 0
         for rb in self.rigidbodies:
-            rb.check_collision_events()
+            if rb.is_static:
+                continue
+            if rb.sleeping:
+                if rb.velocity.x == 0 and rb.velocity.y == 0:
+                    sleeping += 1
+                    continue
+                rb.wake_up()
+            if self.enable_sleeping and rb.can_sleep and rb.velocity.length_squared() < limit:
+                rb.sleep_counter += 1
+            else:
+                rb.sleep_counter = 0
+            awake.append(rb)
+
+        # **アイランド (接触グラフの連結成分) ごとにスリープ判定**
+        parent = {rb: rb for rb in awake}
+        def find(rb):
+            while parent[rb] is not rb:
+                parent[rb] = parent[parent[rb]]
+                rb = parent[rb]
+            return rb
+        for rb in awake:
+            for other in rb.previous_collisions:
+                if other in parent:
+                    root_a, root_b = find(rb), find(other)
+                    if root_a is not root_b:
+                        parent[root_a] = root_b
+        ready = {}
+        for rb in awake:
+            root = find(rb)
+            ready[root] = ready.get(root, True) and rb.sleep_counter >= self.sleep_steps
+        fell_asleep = 0
+        for rb in awake:
+            if ready[find(rb)]:
+                rb.sleep()
+                fell_asleep += 1
+
+        self.sleeping_count = sleeping + fell_asleep
+        self.awake_count = len(awake) - fell_asleep
+
+    def sweep_bullets(self):
+        """
+        弾丸ボディを前ステップの位置から現在位置までスイープし、最初に衝突する位置で止める
+        - 衝突解決の対象 (相手も RigidBody を持つ) だけを障害物とする
+        - 止めた位置は少しだけ食い込ませ、続く狭域判定で通常の衝突として解決させる
+        """
+        self.ccd_hits = 0
+        if not self.bullets:
+            return
+        self.broad_phase.update()
+        for rb in self.bullets:
+            if rb.ccd_origin is None or rb.sleeping:
+                continue
+            obj = rb.game_object
+            collider = obj.get_component(Collider)
+            if collider is None:
+                continue
+            end = obj.transform.global_position
+            displacement = end - rb.ccd_origin
+            length = displacement.length()
+            end_aabb = collider.get_aabb()
+            if length == 0 or end_aabb is None:
+                continue
+            # 移動量が形状の半分未満なら離散判定で十分
+            if length < min(end_aabb[2] - end_aabb[0], end_aabb[3] - end_aabb[1]) * 0.5:
+                continue
+            swept = (
+                min(end_aabb[0], end_aabb[0] - displacement.x), min(end_aabb[1], end_aabb[1] - displacement.y),
+                max(end_aabb[2], end_aabb[2] - displacement.x), max(end_aabb[3], end_aabb[3] - displacement.y)
+            )
+            first = None
+            for other in self.broad_phase.query_aabb(swept):
+                if other.game_object is obj or other.is_trigger or other.game_object.get_component(RigidBody) is None:
+                    continue
+                if not collider.can_collide_with(other):
+                    continue
+                toi = compute_time_of_impact(collider, rb.ccd_origin, displacement, other)
+                if toi is not None and 0 < toi < 1 and (first is None or toi < first):
+                    first = toi
+            if first is None:
+                continue
+            # **衝突位置まで戻す** (in-place 更新で global_position との共有を保つ)
+            clamped = rb.ccd_origin + displacement * first + displacement / length * self.ccd_skin
+            obj.transform.local_position += clamped - end
+            if obj.transform.parent is not None:
+                obj.transform.update_transform()
+            self.ccd_hits += 1
 
     def resolve_collisions(self):
-        """全コライダー間の衝突判定と解決"""
-        num = len(self.colliders)
-        for i in range(num):
-            for j in range(i + 1, num):
-                col1 = self.colliders[i]
-                col2 = self.colliders[j]
-                manifold = compute_collision_manifold(col1, col2)
-                if manifold:
-                    resolve_collision(manifold, col1, col2)
\ No newline at end of file
+        """ブロードフェーズで絞り込んだ候補ペアの衝突判定と解決"""
+        profiler = self.profiler
+        if profiler is not None:
+            lap = time.perf_counter()
+        self.sweep_bullets()
+        if profiler is not None:
+            lap = profiler.lap("ccd", lap)
+        self.broad_phase.update()
+        pairs = self.order_pairs(self.broad_phase.compute_pairs())
+        if profiler is not None:
+            profiler.lap("broad_phase", lap)
+        self.pair_tests = len(pairs)
+        self.skipped_pairs = 0
+        self.contact_count = 0
+        self.resolve_pairs(pairs)
+
+    def resolve_pairs(self, pairs):
+        """
+        候補ペアを狭域判定して解決 (どちらも起きている動的ボディでなければ省略)
+        - ソルバーがない場合、ペアごとの衝突解決は狭域判定の時間に含めて計測する
+        """
+        profiler = self.profiler
+        if profiler is not None:
+            lap = time.perf_counter()
+        contacts = 0
+        manifolds = [] if self.solver is not None else None
+        trigger_overlaps = self.trigger_overlaps
+        for col1, col2 in pairs:
+            # ✅ トリガーは重なりだけを記録 (解決・スリープ解除はしない)
+            if col1.is_trigger or col2.is_trigger:
+                if compute_collision_manifold(col1, col2, self.manifold_pool):
+                    trigger_overlaps.add((col1, col2))
+                continue
+            rb1 = col1.game_object.get_component(RigidBody)
+            rb2 = col2.game_object.get_component(RigidBody)
+            awake1 = rb1 is not None and rb1.is_awake()
+            awake2 = rb2 is not None and rb2.is_awake()
+            if not (awake1 or awake2):
+                self.skipped_pairs += 1
+                continue
+            manifold = compute_collision_manifold(col1, col2, self.manifold_pool)
+            if manifold:
+                contacts += 1
+                # ✅ 起きているボディに触れたスリープ中のボディを起こす
+                if rb1 is not None and rb1.sleeping:
+                    rb1.wake_up()
+                if rb2 is not None and rb2.sleeping:
+                    rb2.wake_up()
+                if manifolds is not None:
+                    manifolds.append((col1, col2, manifold))
+                else:
+                    resolve_collision(manifold, col1, col2)
+        self.contact_count += contacts
+        if profiler is not None:
+            lap = profiler.lap("narrow_phase", lap)
+        # ✅ ソルバーがあれば接触をまとめて反復解決
+        if manifolds is not None:
+            self.solver.solve(manifolds)
+            if profiler is not None:
+                profiler.lap("solver", lap)
+
+    # ** 空間クエリ (ブロードフェーズで候補を絞ってから形状で判定) **
+    # 候補の AABB は直近ステップの後の位置 (今フレームに追加されたオブジェクトは次の update から対象)
+    def _refresh_query_proxies(self):
+        """ステップ後の最初のクエリで、衝突解決後の位置をブロードフェーズの AABB に反映"""
+        if self._query_stale:
+            self.broad_phase.update()
+            self._query_stale = False
+
+    def _query_candidates(self, aabb, mask, include_triggers):
+        """AABB と重なり、mask に一致するレイヤーのコライダーを返す"""
+        self._refresh_query_proxies()
+        return [
+            col for col in self.broad_phase.query_aabb(aabb)
+            if (col.layer & mask) != 0 and (include_triggers or not col.is_trigger)
+        ]
+
+    def raycast(self, origin, direction, max_distance, mask=Collider.ALL_LAYERS, include_triggers=True):
+        """
+        レイと最初に交差するコライダーを返す (なければ None)
+        :param origin: レイの始点
+        :param direction: レイの向き (正規化は不要)
+        :param max_distance: レイの長さ
+        :return: `RaycastHit`
+        """
+        origin = pygame.Vector2(origin)
+        direction = pygame.Vector2(direction)
+        if direction.length_squared() == 0 or max_distance <= 0:
+            return None
+        displacement = direction.normalize() * max_distance
+        end = origin + displacement
+        aabb = (min(origin.x, end.x), min(origin.y, end.y), max(origin.x, end.x), max(origin.y, end.y))
+        closest = None
+        for col in self._query_candidates(aabb, mask, include_triggers):
+            result = segment_vs_collider(origin, displacement, col)
+            if result is None:
+                continue
+            t, normal = result
+            if closest is None or t < closest[0]:
+                closest = (t, col, normal)
+        if closest is None:
+            return None
+        t, col, normal = closest
+        return RaycastHit(col, origin + displacement * t, normal, t * max_distance)
+
+    def overlap_circle(self, center, radius, mask=Collider.ALL_LAYERS, include_triggers=True):
+        """円と重なるコライダーの `QueryHit` リストを返す (距離は中心から形状表面まで)"""
+        center = pygame.Vector2(center)
+        aabb = (center.x - radius, center.y - radius, center.x + radius, center.y + radius)
+        hits = []
+        for col in self._query_candidates(aabb, mask, include_triggers):
+            distance = distance_to_collider(col, center)
+            if distance is not None and distance <= radius:
+                hits.append(QueryHit(col, distance))
+        return hits
+
+    def overlap_rect(self, rect, mask=Collider.ALL_LAYERS, include_triggers=True):
+        """矩形 (pygame.Rect または (x, y, 幅, 高さ)) と重なるコライダーの `QueryHit` リストを返す (距離は矩形の中心から)"""
+        x, y, width, height = rect
+        rect_min, rect_max = (x, y), (x + width, y + height)
+        center = pygame.Vector2(x + width / 2, y + height / 2)
+        hits = []
+        for col in self._query_candidates((x, y, x + width, y + height), mask, include_triggers):
+            if rect_overlaps_collider(rect_min, rect_max, col):
+                hits.append(QueryHit(col, distance_to_collider(col, center)))
+        return hits
+
+    def nearest(self, point, k=1, mask=Collider.ALL_LAYERS, max_distance=None, include_triggers=True, exclude=None):
+        """
+        点に近い順に最大 k 個のコライダーの `QueryHit` リストを返す
+        - 探索範囲を倍々に広げ、範囲内で k 個見つかった時点で終了 (全件走査しない)
+        :param max_distance: これより遠いコライダーは対象外 (None なら制限なし)
+        :param exclude: 対象外にする GameObject (自分自身など)
+        """
+        point = pygame.Vector2(point)
+        self._refresh_query_proxies()
+        total = None
+        radius = 64.0 if max_distance is None else min(64.0, max_distance)
+        while True:
+            aabb = (point.x - radius, point.y - radius, point.x + radius, point.y + radius)
+            candidates = self.broad_phase.query_aabb(aabb)
+            hits = []
+            for col in candidates:
+                if (col.layer & mask) == 0 or (not include_triggers and col.is_trigger) or col.game_object is exclude:
+                    continue
+                distance = distance_to_collider(col, point)
+                if distance is not None:
+                    hits.append(QueryHit(col, distance))
+            hits.sort(key=lambda hit: hit.distance)
+            # ✅ 半径 radius 以内のコライダーは漏れなく候補に含まれるので、その中で k 個あれば確定
+            confirmed = sum(1 for hit in hits if hit.distance <= radius)
+            if confirmed < k and (max_distance is None or radius < max_distance):
+                if total is None:
+                    total = sum(1 for proxy in self.broad_phase.proxies.values() if proxy.aabb is not None)
+                if len(candidates) < total:
+                    radius = radius * 2 if max_distance is None else min(radius * 2, max_distance)
+                    continue
+            if max_distance is not None:
+                hits = [hit for hit in hits if hit.distance <= max_distance]
+            return hits[:k]
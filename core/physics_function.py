@@ -6,112 +6,296 @@ from core.component.transform import Transform
 # 衝突マニフォールドを格納するクラス
 # ------------------------------
 class CollisionManifold:
+    __slots__ = ("penetration", "normal", "contact_point")
+
     def __init__(self, penetration, normal, contact_point):
         self.penetration = penetration      # 浸透深さ
         self.normal = normal                # 衝突面の法線（衝突解決の方向）
         self.contact_point = contact_point  # 衝突接触点
 
+class ManifoldPool:
+    """
+    CollisionManifold を使い回すプール (物理エンジンがステップの最初に release_all する)
+    - 取得したマニフォールドは次のステップまでしか有効でない (保持する場合は値をコピーする)
+    """
+    __slots__ = ("items", "used")
+
+    def __init__(self):
+        self.items = []
+        self.used = 0
+
+    def acquire(self, penetration, nx, ny, cx, cy):
+        """値を設定したマニフォールドを取得 (足りなければ新しく作る)"""
+        if self.used < len(self.items):
+            manifold = self.items[self.used]
+            manifold.penetration = penetration
+            manifold.normal.update(nx, ny)
+            manifold.contact_point.update(cx, cy)
+        else:
+            manifold = CollisionManifold(penetration, pygame.Vector2(nx, ny), pygame.Vector2(cx, cy))
+            self.items.append(manifold)
+        self.used += 1
+        return manifold
+
+    def release_all(self):
+        """すべてのマニフォールドを未使用に戻す"""
+        self.used = 0
+
+def _make_manifold(pool, penetration, nx, ny, cx, cy):
+    if pool is not None:
+        return pool.acquire(penetration, nx, ny, cx, cy)
+    return CollisionManifold(penetration, pygame.Vector2(nx, ny), pygame.Vector2(cx, cy))
+
+# ------------------------------
+# 空間クエリの結果 (軽量なヒット情報)
+# ------------------------------
+class RaycastHit:
+    def __init__(self, collider, point, normal, distance):
+        self.collider = collider    # ヒットしたコライダー
+        self.point = point          # レイとの交点 (グローバル座標)
+        self.normal = normal        # 交点での表面の法線
+        self.distance = distance    # レイの始点からの距離
+
+class QueryHit:
+    def __init__(self, collider, distance):
+        self.collider = collider    # 条件に一致したコライダー
+        self.distance = distance    # クエリ点から形状表面までの距離 (内部なら 0)
+
 # ------------------------------
 # 衝突判定・マニフォールド計算関数
 # ------------------------------
 
 # 円 vs 円 の衝突マニフォールド計算
-def circle_vs_circle_manifold(c1, c2):
-    transform1 = c1.game_object.get_component(Transform)
-    transform2 = c2.game_object.get_component(Transform)
-    pos1 = transform1.get_global_position()
-    pos2 = transform2.get_global_position()
-    delta = pos2 - pos1
-    dist = delta.length()
+def circle_vs_circle_manifold(c1, c2, pool=None):
+    pos1 = c1.game_object.transform.global_position
+    pos2 = c2.game_object.transform.global_position
+    dx = pos2.x - pos1.x
+    dy = pos2.y - pos1.y
     sum_radii = c1.radius + c2.radius
+    dist_sq = dx * dx + dy * dy
+    if dist_sq >= sum_radii * sum_radii and dist_sq != 0:
+        return None  # 衝突していない
 
-    if dist == 0:
+    if dist_sq == 0:
         # ２つの円の中心が一致している場合（非常に特殊な状況）には、任意の方向を設定
-        normal = pygame.Vector2(1, 0)
-        penetration = sum_radii
-        contact_point = pos1
-        return CollisionManifold(penetration, normal, contact_point)
-    if dist >= sum_radii:
-        return None  # 衝突していない
+        return _make_manifold(pool, sum_radii, 1.0, 0.0, pos1.x, pos1.y)
 
-    penetration = sum_radii - dist
-    normal = delta.normalize()
+    dist = math.sqrt(dist_sq)
+    nx = dx / dist
+    ny = dy / dist
     # 接触点は円の境界上の点（pos1 から c1.radius 進んだ位置）とする
-    contact_point = pos1 + normal * c1.radius
-    return CollisionManifold(penetration, normal, contact_point)
+    return _make_manifold(pool, sum_radii - dist, nx, ny, pos1.x + nx * c1.radius, pos1.y + ny * c1.radius)
 
 # 矩形 vs 矩形 の衝突マニフォールド計算（AABB として扱う）
-def box_vs_box_manifold(b1, b2):
-    pos1 = b1.game_object.transform.get_global_position()  # ※ Transform は game_object 経由で取得済みである前提
-    pos2 = b2.game_object.transform.get_global_position()
-    # 右下の座標を計算
-    r1 = pygame.Vector2(pos1.x + b1.width, pos1.y + b1.height)
-    r2 = pygame.Vector2(pos2.x + b2.width, pos2.y + b2.height)
-    
-    overlap_x = min(r1.x, r2.x) - max(pos1.x, pos2.x)
-    overlap_y = min(r1.y, r2.y) - max(pos1.y, pos2.y)
+def box_vs_box_manifold(b1, b2, pool=None):
+    pos1 = b1.game_object.transform.global_position
+    pos2 = b2.game_object.transform.global_position
+    # 右下の座標
+    r1x, r1y = pos1.x + b1.width, pos1.y + b1.height
+    r2x, r2y = pos2.x + b2.width, pos2.y + b2.height
+
+    min_x, max_x = max(pos1.x, pos2.x), min(r1x, r2x)
+    min_y, max_y = max(pos1.y, pos2.y), min(r1y, r2y)
+    overlap_x = max_x - min_x
+    overlap_y = max_y - min_y
     if overlap_x <= 0 or overlap_y <= 0:
         return None  # 衝突していない
 
-    # どちらの軸方向の重なりが小さいかで、法線方向を決定する
+    # どちらの軸方向の重なりが小さいかで、法線方向を決定する (他の関数と同じく b1 → b2 向き)
     if overlap_x < overlap_y:
-        if pos1.x < pos2.x:
-            normal = pygame.Vector2(-1, 0)
-        else:
-            normal = pygame.Vector2(1, 0)
+        nx, ny = (1.0, 0.0) if pos1.x < pos2.x else (-1.0, 0.0)
         penetration = overlap_x
     else:
-        if pos1.y < pos2.y:
-            normal = pygame.Vector2(0, -1)
-        else:
-            normal = pygame.Vector2(0, 1)
+        nx, ny = (0.0, 1.0) if pos1.y < pos2.y else (0.0, -1.0)
         penetration = overlap_y
 
     # 接触点は重なっている領域の中心を採用
-    contact_point = pygame.Vector2(
-        (max(pos1.x, pos2.x) + min(r1.x, r2.x)) / 2,
-        (max(pos1.y, pos2.y) + min(r1.y, r2.y)) / 2
-    )
-    return CollisionManifold(penetration, normal, contact_point)
+    return _make_manifold(pool, penetration, nx, ny, (min_x + max_x) / 2, (min_y + max_y) / 2)
 
 # 矩形 vs 円 の衝突マニフォールド計算
-def box_vs_circle_manifold(box, circle):
-    rect_pos = box.game_object.transform.get_global_position()
-    circle_pos = circle.game_object.transform.get_global_position()
+def box_vs_circle_manifold(box, circle, pool=None):
+    rect_pos = box.game_object.transform.global_position
+    circle_pos = circle.game_object.transform.global_position
     # 円の中心に最も近い矩形上の点を求める
     closest_x = max(rect_pos.x, min(circle_pos.x, rect_pos.x + box.width))
     closest_y = max(rect_pos.y, min(circle_pos.y, rect_pos.y + box.height))
-    closest_point = pygame.Vector2(closest_x, closest_y)
-    delta = circle_pos - closest_point
-    dist = delta.length()
+    dx = circle_pos.x - closest_x
+    dy = circle_pos.y - closest_y
+    dist = math.hypot(dx, dy)
     if dist > circle.radius:
         return None  # 衝突していない
     if dist == 0:
-        normal = pygame.Vector2(1, 0)
-        penetration = circle.radius
-        contact_point = closest_point
-    else:
-        normal = delta.normalize()
-        penetration = circle.radius - dist
-        contact_point = closest_point
-    return CollisionManifold(penetration, normal, contact_point)
+        return _make_manifold(pool, circle.radius, 1.0, 0.0, closest_x, closest_y)
+    return _make_manifold(pool, circle.radius - dist, dx / dist, dy / dist, closest_x, closest_y)
 
 # 各コライダー間の衝突マニフォールドを計算するディスパッチ関数
-def compute_collision_manifold(collider1, collider2):
+def compute_collision_manifold(collider1, collider2, pool=None):
+    """
+    :param pool: ManifoldPool を渡すとマニフォールドを使い回す (None なら毎回生成)
+    """
     # インポートは相互参照に注意
     from core.component.physics.circle_collider import CircleCollider
     from core.component.physics.box_collider import BoxCollider
 
     if isinstance(collider1, CircleCollider) and isinstance(collider2, CircleCollider):
-        return circle_vs_circle_manifold(collider1, collider2)
+        return circle_vs_circle_manifold(collider1, collider2, pool)
     elif isinstance(collider1, BoxCollider) and isinstance(collider2, BoxCollider):
-        return box_vs_box_manifold(collider1, collider2)
+        return box_vs_box_manifold(collider1, collider2, pool)
     elif isinstance(collider1, BoxCollider) and isinstance(collider2, CircleCollider):
-        return box_vs_circle_manifold(collider1, collider2)
+        return box_vs_circle_manifold(collider1, collider2, pool)
     elif isinstance(collider1, CircleCollider) and isinstance(collider2, BoxCollider):
-        manifold = box_vs_circle_manifold(collider2, collider1)
+        manifold = box_vs_circle_manifold(collider2, collider1, pool)
         if manifold is not None:
-            manifold.normal = -manifold.normal  # 逆方向にする
+            manifold.normal *= -1  # 逆方向にする (in-place)
         return manifold
     return None
 
+
+# ------------------------------
+# 連続衝突判定 (CCD)・衝突時刻 (TOI) 計算関数
+# ------------------------------
+
+# 移動する円が静止円に最初に接触する時刻 t (0〜1) を計算 (接触しなければ None)
+def swept_circle_vs_circle(start, displacement, radius, center, other_radius):
+    sum_radii = radius + other_radius
+    m = start - center
+    a = displacement.dot(displacement)
+    b = m.dot(displacement)
+    c = m.dot(m) - sum_radii * sum_radii
+    if c < 0:
+        return 0.0  # 開始時点で重なっている
+    if a == 0 or b >= 0:
+        return None  # 動いていない・離れる方向に動いている
+    discriminant = b * b - a * c
+    if discriminant < 0:
+        return None
+    t = (-b - math.sqrt(discriminant)) / a
+    return t if t <= 1 else None
+
+# 線分 (origin → origin+displacement) が AABB に入る時刻 t (0〜1) を計算 (スラブ法)
+def _segment_vs_aabb(origin, displacement, box_min, box_max):
+    t_enter, t_exit = 0.0, 1.0
+    for axis in (0, 1):
+        o = origin[axis]
+        d = displacement[axis]
+        if d == 0:
+            if o < box_min[axis] or o > box_max[axis]:
+                return None
+            continue
+        t1 = (box_min[axis] - o) / d
+        t2 = (box_max[axis] - o) / d
+        if t1 > t2:
+            t1, t2 = t2, t1
+        t_enter = max(t_enter, t1)
+        t_exit = min(t_exit, t2)
+        if t_enter > t_exit:
+            return None
+    return t_enter
+
+# 移動する円が静止した AABB に最初に接触する時刻 t (0〜1) を計算 (角は丸めて厳密に判定)
+def swept_circle_vs_aabb(start, displacement, radius, box_min, box_max):
+    expanded_min = pygame.Vector2(box_min[0] - radius, box_min[1] - radius)
+    expanded_max = pygame.Vector2(box_max[0] + radius, box_max[1] + radius)
+    t = _segment_vs_aabb(start, displacement, expanded_min, expanded_max)
+    if t is None:
+        return None
+    hit = start + displacement * t
+    if box_min[0] <= hit.x <= box_max[0] or box_min[1] <= hit.y <= box_max[1]:
+        return t  # 辺に接触
+    # 角の領域では角を中心とする円との接触として判定
+    corner = pygame.Vector2(
+        box_min[0] if hit.x < box_min[0] else box_max[0],
+        box_min[1] if hit.y < box_min[1] else box_max[1]
+    )
+    return swept_circle_vs_circle(start, displacement, radius, corner, 0)
+
+# 移動する AABB が静止した AABB に最初に接触する時刻 t (0〜1) を計算
+def swept_aabb_vs_aabb(start, displacement, width, height, box_min, box_max):
+    expanded_min = pygame.Vector2(box_min[0] - width, box_min[1] - height)
+    return _segment_vs_aabb(start, displacement, expanded_min, box_max)
+
+# 移動するコライダーと静止コライダーの衝突時刻を計算するディスパッチ関数
+# start は移動するコライダーの開始位置 (円は中心、矩形は左上)
+def compute_time_of_impact(collider, start, displacement, other):
+    from core.component.physics.circle_collider import CircleCollider
+    from core.component.physics.box_collider import BoxCollider
+
+    other_pos = other.game_object.transform.get_global_position()
+    if isinstance(collider, CircleCollider):
+        if isinstance(other, CircleCollider):
+            return swept_circle_vs_circle(start, displacement, collider.radius, other_pos, other.radius)
+        if isinstance(other, BoxCollider):
+            box_max = (other_pos.x + other.width, other_pos.y + other.height)
+            return swept_circle_vs_aabb(start, displacement, collider.radius, other_pos, box_max)
+    elif isinstance(collider, BoxCollider):
+        if isinstance(other, BoxCollider):
+            box_max = (other_pos.x + other.width, other_pos.y + other.height)
+            return swept_aabb_vs_aabb(start, displacement, collider.width, collider.height, other_pos, box_max)
+        if isinstance(other, CircleCollider):
+            # 円から見て矩形が逆向きに動くと考える
+            box_max = (start.x + collider.width, start.y + collider.height)
+            return swept_circle_vs_aabb(other_pos, -displacement, other.radius, start, box_max)
+    return None
+
+
+# ------------------------------
+# 空間クエリ用の形状判定関数
+# ------------------------------
+
+# コライダーの形状 (円は中心と半径、矩形は左上と右下) を取得
+def _collider_shape(collider):
+    from core.component.physics.circle_collider import CircleCollider
+    from core.component.physics.box_collider import BoxCollider
+
+    pos = collider.game_object.transform.global_position
+    if isinstance(collider, CircleCollider):
+        return "circle", pos, collider.radius
+    if isinstance(collider, BoxCollider):
+        return "box", pos, pygame.Vector2(pos.x + collider.width, pos.y + collider.height)
+    return None, None, None
+
+# 点からコライダー表面までの距離 (内部なら 0・未対応の形状は None)
+def distance_to_collider(collider, point):
+    kind, a, b = _collider_shape(collider)
+    if kind == "circle":
+        return max(point.distance_to(a) - b, 0.0)
+    if kind == "box":
+        dx = max(a.x - point.x, 0.0, point.x - b.x)
+        dy = max(a.y - point.y, 0.0, point.y - b.y)
+        return math.hypot(dx, dy)
+    return None
+
+# 矩形 (min, max) とコライダーが重なっているか
+def rect_overlaps_collider(rect_min, rect_max, collider):
+    kind, a, b = _collider_shape(collider)
+    if kind == "circle":
+        dx = max(rect_min[0] - a.x, 0.0, a.x - rect_max[0])
+        dy = max(rect_min[1] - a.y, 0.0, a.y - rect_max[1])
+        return dx * dx + dy * dy <= b * b
+    if kind == "box":
+        return a.x <= rect_max[0] and rect_min[0] <= b.x and a.y <= rect_max[1] and rect_min[1] <= b.y
+    return False
+
+# 線分 (origin → origin+displacement) とコライダーの最初の交差時刻 t (0〜1) と法線を計算
+def segment_vs_collider(origin, displacement, collider):
+    kind, a, b = _collider_shape(collider)
+    if kind == "circle":
+        t = swept_circle_vs_circle(origin, displacement, 0, a, b)
+        if t is None:
+            return None
+        normal = origin + displacement * t - a
+        return t, normal.normalize() if normal.length_squared() > 0 else -displacement.normalize()
+    if kind == "box":
+        t = _segment_vs_aabb(origin, displacement, a, b)
+        if t is None:
+            return None
+        point = origin + displacement * t
+        # 交点が乗っている面から法線を決める (内部から始まった場合はレイの逆向き)
+        if t == 0 and a.x < point.x < b.x and a.y < point.y < b.y:
+            return t, -displacement.normalize()
+        faces = (
+            (abs(point.x - a.x), pygame.Vector2(-1, 0)), (abs(point.x - b.x), pygame.Vector2(1, 0)),
+            (abs(point.y - a.y), pygame.Vector2(0, -1)), (abs(point.y - b.y), pygame.Vector2(0, 1))
+        )
+        return t, min(faces, key=lambda face: face[0])[1]
+    return None
@@ -0,0 +1,92 @@
+import csv
+import json
+import time
+from collections import deque
+
+# ------------------------------
+# 物理エンジンのフェーズ別計測 (PhysicsEngine.enable_profiling で有効化)
+# ------------------------------
+
+class PhysicsProfiler:
+    """
+    ステップごとのフェーズ別時間 [ms] と候補ペア数・接触数をリングバッファに記録する
+    - 無効時は PhysicsEngine.profiler が None なので、計測コードは None 判定のみ
+    """
+    PHASES = ("registry", "integration", "ccd", "broad_phase", "narrow_phase", "solver", "events", "sleep")
+    COUNTERS = ("pairs", "contacts", "skipped_pairs", "trigger_batches", "awake", "sleeping")
+
+    def __init__(self, capacity=300):
+        """
+        :param capacity: 保持するステップ数 (古い記録から捨てる)
+        """
+        self.records = deque(maxlen=capacity)
+        self.current = None  # 記録中のステップ (登録処理はステップ開始前に加算される)
+
+    def _record(self):
+        if self.current is None:
+            self.current = dict.fromkeys(self.PHASES, 0.0)
+        return self.current
+
+    def lap(self, phase, start):
+        """start からの経過時間を phase に加算し、現在時刻を返す (次のフェーズの開始時刻)"""
+        now = time.perf_counter()
+        record = self._record()
+        record[phase] += (now - start) * 1000
+        return now
+
+    def end_step(self, engine, step_start):
+        """ステップの記録を確定してリングバッファに追加"""
+        record = self._record()
+        record["total"] = (time.perf_counter() - step_start) * 1000 + record["registry"]
+        record["step"] = engine.step_count
+        record["pairs"] = engine.pair_tests
+        record["contacts"] = engine.contact_count
+        record["skipped_pairs"] = engine.skipped_pairs
+        record["trigger_batches"] = engine.trigger_batches
+        record["awake"] = engine.awake_count
+        record["sleeping"] = engine.sleeping_count
+        self.records.append(record)
+        self.current = None
+
+    def clear(self):
+        self.records.clear()
+        self.current = None
+
+    def latest(self):
+        """直近のステップの記録 (なければ None)"""
+        return self.records[-1] if self.records else None
+
+    def averages(self, last=None):
+        """直近 last ステップ (None なら全件) の平均値"""
+        records = list(self.records)[-last:] if last else list(self.records)
+        if not records:
+            return {}
+        keys = ("total",) + self.PHASES + self.COUNTERS
+        return {key: sum(record[key] for record in records) / len(records) for key in keys}
+
+    def summary(self, last=60):
+        """オーバーレイ表示用の 1 行の文字列"""
+        avg = self.averages(last)
+        if not avg:
+            return "physics: -"
+        return (
+            f"physics {avg['total']:.2f}ms "
+            f"(bp {avg['broad_phase']:.2f} / np {avg['narrow_phase']:.2f} / solve {avg['solver']:.2f}) "
+            f"pairs {avg['pairs']:.0f} contacts {avg['contacts']:.0f}"
+        )
+
+    def _fields(self):
+        return ("step", "total") + self.PHASES + self.COUNTERS
+
+    def dump_csv(self, path):
+        """記録を CSV に書き出す"""
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.DictWriter(file, fieldnames=self._fields())
+            writer.writeheader()
+            for record in self.records:
+                writer.writerow({key: record[key] for key in self._fields()})
+
+    def dump_json(self, path):
+        """記録を JSON (1 ステップ 1 オブジェクトの配列) に書き出す"""
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump([{key: record[key] for key in self._fields()} for record in self.records], file, indent=2)
@@ -0,0 +1,53 @@
+from operator import itemgetter
+
+# ------------------------------
+# 描画コマンドのキュー (Camera.render_scene でスプライトをまとめて描画)
+# ------------------------------
+
+class RenderQueue:
+    """
+    コンポーネントが積んだ (Surface, 描画位置) のコマンドを (フロア, レイヤー, 積んだ順) で並べ、
+    Surface.blits の 1 回の呼び出しでまとめて描画する
+    - 積むだけのコンポーネント (Sprite.submit) は 1 件ごとの blit 呼び出しのオーバーヘッドがなくなる
+    - 直接描画するコンポーネントの前では flush して、それまでのコマンドとの前後関係を保つ
+    """
+    _order = itemgetter(0, 1, 2)
+
+    def __init__(self):
+        self.commands = []    # [(フロア, レイヤー, 積んだ順, Surface, 描画位置)] (積んだ順は flush ごとに 0 から)
+        self.submitted = 0    # 直近のフレームで積まれたコマンド数
+        self.draw_calls = 0   # 直近のフレームで呼んだ blits の回数
+
+    def submit(self, surface, dest, layer=0, floor=0):
+        """
+        描画コマンドを積む
+        :param dest: 描画先の左上座標 (x, y)
+        """
+        commands = self.commands
+        commands.append((floor, layer, len(commands), surface, dest))
+
+    def submit_centered(self, surface, center_x, center_y, half_width, half_height, layer=0, floor=0):
+        """
+        画像の中心を (center_x, center_y) に合わせる描画コマンドを積む (Sprite.submit 用)
+        - 左上座標は surface.get_rect(center=...) と同じ (中心 - 幅 // 2)
+        - half_width / half_height は呼び出し側でキャッシュした値を渡す
+        """
+        commands = self.commands
+        commands.append((floor, layer, len(commands), surface, (center_x - half_width, center_y - half_height)))
+
+    def flush(self, target):
+        """積まれたコマンドを並べ替えて target に描画し、キューを空にする"""
+        commands = self.commands
+        if not commands:
+            return
+        commands.sort(key=self._order)
+        target.blits([(command[3], command[4]) for command in commands], doreturn=False)
+        self.submitted += len(commands)
+        self.draw_calls += 1
+        commands.clear()
+
+    def begin_frame(self):
+        """フレームの始めに統計をリセット"""
+        self.commands.clear()
+        self.submitted = 0
+        self.draw_calls = 0
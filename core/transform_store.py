@@ -0,0 +1,171 @@
+from itertools import chain
+import pygame
+
+try:
+    import numpy as np
+except ImportError:  # NumPy がない環境では Transform ごとの update_transform のみ使用可能
+    np = None
+
+# ------------------------------
+# 配列で階層全体の Transform を一括計算するストア (Floor.set_transform_store で有効化)
+# ------------------------------
+
+class TransformStore:
+    """
+    親インデックス・ローカル TRS・グローバル TRS を NumPy 配列で持ち、階層全体を深さごとに一括計算する
+    - 登録された Transform は従来どおり pygame.Vector2 / Vector3 を持ち、ストアはその値を読み書きする
+      (既存のコンポーネントのコードはそのまま動く)
+    - **Transform は配列のビューではない**: pygame のベクトルは NumPy 配列のメモリを参照できないため、
+      毎フレーム gather で配列へコピーし、scatter で変わった値だけ書き戻す
+    - 配列はトポロジカル順 (親が必ず子より前)・深さごとのインデックスを保持し、階層が変わったときだけ作り直す
+    - 毎フレーム (オブジェクトの更新のあと): ローカル値の読み込み → 深さごとの配列演算
+      → 値が変わった子だけグローバル値を in-place で書き戻す
+    - setter で変更された Transform (_dirty) は従来どおりその場で計算される
+    """
+    def __init__(self):
+        if np is None:
+            raise ImportError("TransformStore には NumPy が必要です (pip install numpy)")
+        self.transforms = set()   # 登録された Transform
+        self.order = []           # トポロジカル順の Transform (登録されていない祖先も含む)
+        self.levels = []          # 深さ 1 以上の [(子のインデックス, 親のインデックス)]
+        self.is_child = np.zeros(0, dtype=bool)
+        self.dirty = True         # 登録内容・親子関係が変わったら配列を作り直す
+
+        self.global_position = np.zeros((0, 2))
+        self.global_scale = np.zeros((0, 2))
+        self.global_rotation = np.zeros((0, 3))
+
+    def add(self, transform):
+        """Transform と子孫 (GameObject.children) を登録"""
+        if transform.store is not None and transform.store is not self:
+            return  # 他のフロアのストアで管理中
+        transform.store = self
+        self.transforms.add(transform)
+        self.dirty = True
+        for child in transform.game_object.children:
+            self.add(child.transform)
+
+    def remove(self, transform):
+        """Transform と子孫の登録を解除 (以降は従来の update_transform で計算)"""
+        if transform.store is not self:
+            return
+        transform.store = None
+        transform.mark_dirty()
+        self.transforms.discard(transform)
+        self.dirty = True
+        for child in transform.game_object.children:
+            self.remove(child.transform)
+
+    def invalidate(self):
+        """親子関係が変わったことを通知 (次の update で配列を作り直す)"""
+        self.dirty = True
+
+    def rebuild(self):
+        """トポロジカル順と深さごとのインデックスを作り直す"""
+        depth = {}
+        def depth_of(transform):
+            # 登録されていない祖先も計算に含める (親のグローバル値が必要なため)
+            chain = []
+            while transform is not None and transform not in depth:
+                chain.append(transform)
+                transform = transform.parent
+            d = -1 if transform is None else depth[transform]
+            for node in reversed(chain):
+                d += 1
+                depth[node] = d
+        for transform in self.transforms:
+            depth_of(transform)
+
+        self.order = sorted(depth, key=depth.get)
+        index = {transform: i for i, transform in enumerate(self.order)}
+        by_depth = {}
+        for transform in self.order:
+            if depth[transform] > 0:
+                by_depth.setdefault(depth[transform], []).append(transform)
+        self.levels = [
+            (np.array([index[t] for t in nodes], dtype=int), np.array([index[t.parent] for t in nodes], dtype=int))
+            for _, nodes in sorted(by_depth.items())
+        ]
+        self.is_child = np.array([t.parent is not None for t in self.order], dtype=bool)
+
+        # 親なしは local と同じベクトルを共有・子は共有していたら書き戻し前に分離しておく
+        for transform in self.order:
+            if transform.parent is None:
+                transform.global_position = transform.local_position
+                transform.global_scale = transform.local_scale
+                transform.global_rotation = transform.local_rotation
+                continue
+            if transform.global_position is transform.local_position:
+                transform.global_position = pygame.Vector2(transform.local_position)
+            if transform.global_scale is transform.local_scale:
+                transform.global_scale = pygame.Vector2(transform.local_scale)
+            if transform.global_rotation is transform.local_rotation:
+                transform.global_rotation = pygame.Vector3(transform.local_rotation)
+
+        # 前フレームの値は不明なので全件書き戻させる
+        count = len(self.order)
+        self.global_position = np.full((count, 2), np.nan)
+        self.global_scale = np.full((count, 2), np.nan)
+        self.global_rotation = np.full((count, 3), np.nan)
+        self.dirty = False
+
+    def gather(self):
+        """各 Transform のローカル値を配列へ読み込む (物理演算などで in-place に変更されるため毎フレーム)"""
+        count = len(self.order)
+        # Vector2 / Vector3 をそのまま平坦化して読む (成分ごとの属性アクセスより速い)
+        vectors = chain.from_iterable((t.local_position, t.local_scale, t.local_rotation) for t in self.order)
+        values = np.fromiter(chain.from_iterable(vectors), dtype=float, count=count * 7).reshape(count, 7)
+        return values[:, 0:2], values[:, 2:4], values[:, 4:7]
+
+    def compute(self, local_position, local_scale, local_rotation):
+        """深さごとに親のグローバル値からグローバル TRS を一括計算 (Transform.update_transform と同じ式)"""
+        position = local_position.copy()
+        scale = local_scale.copy()
+        rotation = local_rotation.copy()
+        for child, parent in self.levels:
+            scale[child] = scale[parent] * local_scale[child]
+            rotation[child] = rotation[parent] + local_rotation[child]
+            # **親の回転 (z 成分・度数法) でローカル位置を回転**
+            angle = np.radians(rotation[parent, 2])
+            cos_a, sin_a = np.cos(angle), np.sin(angle)
+            x, y = local_position[child, 0], local_position[child, 1]
+            position[child, 0] = position[parent, 0] + x * cos_a - y * sin_a
+            position[child, 1] = position[parent, 1] + x * sin_a + y * cos_a
+        return position, scale, rotation
+
+    def scatter(self, position, scale, rotation):
+        """値が変わった Transform の version を進め、子のグローバル値を in-place で書き戻す (変わった成分のみ)"""
+        position_changed = np.any(position != self.global_position, axis=1)
+        scale_changed = np.any(scale != self.global_scale, axis=1)
+        rotation_changed = np.any(rotation != self.global_rotation, axis=1)
+        order = self.order
+        is_child = self.is_child
+        for i in np.flatnonzero(position_changed | scale_changed | rotation_changed).tolist():
+            transform = order[i]
+            transform.version += 1  # 登録されていない子孫は親の version で変化を検出する
+            if not is_child[i]:
+                # 親なしは local と同じベクトルを共有する (local_position などが差し替えられていたら共有し直す)
+                transform.global_position = transform.local_position
+                transform.global_scale = transform.local_scale
+                transform.global_rotation = transform.local_rotation
+        # 親なしは local と同じベクトルを共有しているので書き戻し不要
+        indices = np.flatnonzero(position_changed & is_child)
+        for i, (x, y) in zip(indices.tolist(), position[indices].tolist()):
+            order[i].global_position.update(x, y)
+        indices = np.flatnonzero(scale_changed & is_child)
+        for i, (x, y) in zip(indices.tolist(), scale[indices].tolist()):
+            order[i].global_scale.update(x, y)
+        indices = np.flatnonzero(rotation_changed & is_child)
+        for i, (x, y, z) in zip(indices.tolist(), rotation[indices].tolist()):
+            order[i].global_rotation.update(x, y, z)
+        self.global_position = position
+        self.global_scale = scale
+        self.global_rotation = rotation
+
+    def update(self):
+        """登録された階層全体のグローバル値を更新 (フレームごとにオブジェクトの更新のあと 1 回)"""
+        if self.dirty:
+            self.rebuild()
+        if not self.order:
+            return
+        self.scatter(*self.compute(*self.gather()))